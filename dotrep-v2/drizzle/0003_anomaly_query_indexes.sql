@@ -0,0 +1,10 @@
+-- Indexes for the anomaly service's actor x week query
+-- (dotrep-v2/services/anomaly_service/app.py: _weekly_matrix_query)
+
+-- Range scans on the activity window: anchoredAt >= ? and
+-- (anchoredAt IS NULL AND createdAt >= ?), covering the proofHash join key
+CREATE INDEX IF NOT EXISTS `idx_proofs_anchor` ON `proofs` (`anchoredAt`, `createdAt`, `proofHash`);
+
+-- Join from proofs.proofHash (varchar(128)) to contributions.proofCid (text),
+-- carrying repoOwner for the GROUP BY
+CREATE INDEX IF NOT EXISTS `idx_contrib_owner_proof` ON `contributions` (`proofCid`(128), `repoOwner`);
@@ -4,11 +4,13 @@ Uses IsolationForest to detect suspicious contribution patterns
 """
 import os
 import json
+from datetime import date, timedelta
+from functools import lru_cache
+from urllib.parse import quote
 from typing import Optional, List, Dict, Any, Tuple
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-import pymysql
-import pandas as pd
+import connectorx as cx
 import numpy as np
 from sklearn.ensemble import IsolationForest
 from dotenv import load_dotenv
@@ -33,6 +35,10 @@ else:
     DB_PASSWORD = parsed.password or ""
     DB_NAME = parsed.path.lstrip("/") if parsed.path else "dotrep"
 
+# ConnectorX connection URI (read path); credentials are percent-encoded
+# (quote, not quote_plus: a "+" in URL userinfo is a literal plus, not a space)
+MYSQL_URI = f"mysql://{quote(DB_USER, safe='')}:{quote(DB_PASSWORD, safe='')}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
 app = FastAPI(title="DotRep Anomaly Service", version="1.0.0")
 
 
@@ -48,49 +54,74 @@ class AnomalyResponse(BaseModel):
     count: int
 
 
-def get_db_connection():
-    """Get MySQL database connection"""
-    return pymysql.connect(
-        host=DB_HOST,
-        port=DB_PORT,
-        user=DB_USER,
-        password=DB_PASSWORD,
-        database=DB_NAME,
-        cursorclass=pymysql.cursors.DictCursor,
-        charset='utf8mb4'
+@lru_cache(maxsize=32)
+def _weekly_matrix_query(weeks: int, current_week: date) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Build the actor x week conditional-aggregation query for a fixed window
+    
+    Returns the SQL and the ISO week labels (oldest first) matching the
+    w_0..w_{n-1} columns. Cached per (weeks, current ISO week start).
+    """
+    week_starts = [current_week - timedelta(weeks=i) for i in range(weeks, -1, -1)]
+    labels = tuple(f"{d.isocalendar()[0]}-{d.isocalendar()[1]:02d}" for d in week_starts)
+    
+    # COALESCE(p.anchoredAt, p.createdAt, ...) wrapped the filtered column in a
+    # function, forcing a full scan. proofs.createdAt is NOT NULL, so split the
+    # window into two disjoint range predicates on idx_proofs_anchor instead
+    # (see drizzle/0003_anomaly_query_indexes.sql) and bucket in the outer query
+    start = week_starts[0].isoformat()
+    buckets = ",\n            ".join(
+        f"COUNT(CASE WHEN DATE_FORMAT(a.ts, '%x-%v') = '{label}' THEN 1 END) as w_{i}"
+        for i, label in enumerate(labels)
     )
-
-
-def build_actor_week_matrix(weeks: int = 12) -> Tuple[pd.DataFrame, List[str]]:
-    """Query weekly counts per actor for last `weeks` weeks"""
-    conn = get_db_connection()
-    try:
-        query = f"""
-            SELECT 
-                c.repoOwner as actor,
-                DATE_FORMAT(COALESCE(p.anchoredAt, p.createdAt, c.createdAt), '%Y-%m-%d') as wk,
-                COUNT(*) as cnt
+    query = f"""
+        SELECT 
+            a.actor as actor,
+            {buckets}
+        FROM (
+            SELECT c.repoOwner as actor, p.anchoredAt as ts
+            FROM proofs p
+            JOIN contributions c ON c.proofCid = p.proofHash
+            WHERE p.anchoredAt >= '{start}'
+            UNION ALL
+            SELECT c.repoOwner as actor, p.createdAt as ts
             FROM proofs p
-            LEFT JOIN contributions c ON c.proofCid = p.proofHash
-            WHERE COALESCE(p.anchoredAt, p.createdAt, c.createdAt) >= DATE_SUB(NOW(), INTERVAL {weeks} WEEK)
-                AND c.repoOwner IS NOT NULL
-            GROUP BY c.repoOwner, wk
-            ORDER BY c.repoOwner, wk;
-        """
-        df = pd.read_sql(query, conn)
-        
-        if df.empty:
-            return pd.DataFrame(), []
-        
-        # Pivot to actor x week matrix, fill missing weeks with 0
-        mat = df.pivot_table(index='actor', columns='wk', values='cnt', fill_value=0)
-        # Ensure columns are ordered (most recent last)
-        if len(mat.columns) > 0:
-            mat = mat.reindex(sorted(mat.columns), axis=1)
-        actors = mat.index.tolist()
-        return mat, actors
-    finally:
-        conn.close()
+            JOIN contributions c ON c.proofCid = p.proofHash
+            WHERE p.anchoredAt IS NULL AND p.createdAt >= '{start}'
+        ) a
+        WHERE a.actor IS NOT NULL
+        GROUP BY a.actor
+    """
+    return query, labels
+
+
+def build_actor_week_matrix(weeks: int = 12) -> Tuple[np.ndarray, List[str], List[str]]:
+    """
+    Query weekly counts per actor for last `weeks` weeks
+    
+    Returns a float32 (actors x weeks) count matrix, the actor ids and the
+    ISO week labels of its columns (oldest first).
+    """
+    today = date.today()
+    current_week = today - timedelta(days=today.weekday())
+    query, labels = _weekly_matrix_query(int(weeks), current_week)
+    
+    # The server returns one pre-pivoted row per actor; ConnectorX decodes it
+    # natively into Arrow. The read is not partitioned: ConnectorX would run a
+    # MIN/MAX query plus one wrapped query per partition, re-executing the whole
+    # UNION ALL + GROUP BY each time, and the aggregate has no indexed column to split on
+    tbl = cx.read_sql(MYSQL_URI, query, return_type="arrow")
+    
+    if tbl.num_rows == 0:
+        return np.empty((0, len(labels)), dtype=np.float32), [], list(labels)
+    
+    # Copy the w_i count columns straight into a preallocated float32 matrix
+    # (COUNT() columns are non-null integers, so no pandas round-trip is needed)
+    X = np.empty((tbl.num_rows, len(labels)), dtype=np.float32)
+    for i in range(len(labels)):
+        X[:, i] = tbl.column(f"w_{i}").to_numpy()
+    actors = tbl.column("actor").to_pylist()
+    return X, actors, list(labels)
 
 
 @app.post("/anomaly/detect", response_model=AnomalyResponse)
@@ -99,39 +130,46 @@ def detect_anomalies(payload: AnomalyRequest):
     weeks = payload.weeks
     contamination = payload.contamination
     
-    # Build matrix
-    mat, actors = build_actor_week_matrix(weeks)
-    if mat.empty:
+    # Build matrix: raw weekly counts
+    # (float32 end-to-end; IsolationForest builds its trees on float32 anyway)
+    X, actors, week_labels = build_actor_week_matrix(weeks)
+    if not actors:
         return AnomalyResponse(ok=True, anomalies=[], count=0)
     
-    # Feature matrix: use raw weekly counts and also simple stats
-    X = mat.values.astype(float)
-    
     # Add per-actor summary features (mean, std)
-    means = X.mean(axis=1).reshape(-1, 1)
-    stds = X.std(axis=1).reshape(-1, 1)
+    means = X.mean(axis=1, keepdims=True, dtype=np.float32)
+    stds = X.std(axis=1, keepdims=True, dtype=np.float32)
     # Handle NaN values
     means = np.nan_to_num(means, nan=0.0)
     stds = np.nan_to_num(stds, nan=0.0)
     
-    Xf = np.hstack([X, means, stds])
+    Xf = np.hstack([X, means, stds]).astype(np.float32, copy=False)
     
-    # Fit IsolationForest
-    iso = IsolationForest(contamination=contamination, random_state=42)
+    # Fit IsolationForest (trees are independent, so fan out across cores;
+    # path-length averaging saturates well below 100 trees at this scale)
+    iso = IsolationForest(
+        contamination=contamination,
+        random_state=42,
+        n_jobs=-1,
+        n_estimators=50,
+        max_samples=min(256, Xf.shape[0])
+    )
     iso.fit(Xf)
+    # Score the forest once; decision_function already subtracts offset_, so
+    # negative scores are exactly what predict() would label -1
     scores = iso.decision_function(Xf)  # higher => less anomalous
-    preds = iso.predict(Xf)  # -1 anomaly, 1 normal
+    is_anomaly = scores < 0
     
+    # Only materialize rows for flagged actors, straight from the numpy matrix
     anomalies = []
-    for i, actor in enumerate(actors):
-        if preds[i] == -1:
-            anomalies.append({
-                "actor": actor,
-                "score": float(scores[i]),
-                "weeks_vector": mat.iloc[i].to_dict(),
-                "mean": float(means[i][0]),
-                "std": float(stds[i][0]) if stds[i][0] > 0 else 0.0
-            })
+    for i in np.flatnonzero(is_anomaly):
+        anomalies.append({
+            "actor": actors[i],
+            "score": float(scores[i]),
+            "weeks_vector": dict(zip(week_labels, X[i].tolist())),
+            "mean": float(means[i, 0]),
+            "std": float(stds[i, 0]) if stds[i, 0] > 0 else 0.0
+        })
     
     return AnomalyResponse(ok=True, anomalies=anomalies, count=len(anomalies))
 
@@ -140,8 +178,8 @@ def detect_anomalies(payload: AnomalyRequest):
 def health():
     """Health check endpoint"""
     try:
-        conn = get_db_connection()
-        conn.close()
+        # Same ConnectorX connection path the matrix read uses
+        cx.read_sql(MYSQL_URI, "SELECT 1 AS ok", return_type="arrow")
         return {"ok": True, "status": "healthy", "database": "connected"}
     except Exception as e:
         return {"ok": False, "status": "unhealthy", "error": str(e)}
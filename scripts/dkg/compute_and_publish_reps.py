@@ -2,39 +2,143 @@
 """
 compute_and_publish_reps.py
 - Queries the OriginTrail DKG SPARQL endpoint for creators and edges
-- Builds a NetworkX DiGraph, computes PageRank (optionally weighted)
+- Builds the creator graph as a CSR adjacency matrix, computes PageRank
+  (optionally weighted) by sparse power iteration
 - Emits a JSON-LD Reputation Asset per creator
 - Optionally POSTs the JSON-LD to a user-specified PUBLISH_URL (Edge Node publish API)
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import argparse
 import json
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import networkx as nx
-from uuid import uuid4
+import numpy as np
+import scipy.sparse
+import threading
+from uuid import UUID
 from datetime import datetime, timezone
+from pathlib import Path
 import os
 import sys
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sparql_cache import cached_query, add_cache_args
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Enhanced temporal PageRank from services/reputation, resolved once at import
+try:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'services', 'reputation'))
+    from enhanced_pagerank import TemporalPageRank
+    _TEMPORAL = TemporalPageRank
+except ImportError:
+    _TEMPORAL = None
+
+# ijson parses SPARQL responses incrementally from the socket
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# python-igraph runs PageRank (PRPACK) in C over its own integer edge list
+try:
+    import igraph
+    IGRAPH_AVAILABLE = True
+except ImportError:
+    IGRAPH_AVAILABLE = False
+
+# Numba compiles the power-iteration SpMV into a parallel native loop
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _spmv_pr(indptr, indices, data, x_in, x_out, alpha, teleport, dangle_mass):
+        """One PageRank step over the in-link CSR matrix, rows in parallel."""
+        for i in prange(x_in.shape[0]):
+            s = 0.0
+            for k in range(indptr[i], indptr[i + 1]):
+                s += data[k] * x_in[indices[k]]
+            x_out[i] = alpha * (s + dangle_mass * teleport[i]) + (1 - alpha) * teleport[i]
+
+    # Compile once at import so the first real graph doesn't pay for it
+    _spmv_pr(np.array([0, 1], dtype=np.int32), np.array([0], dtype=np.int32), np.array([1.0]),
+             np.ones(1), np.empty(1), 0.85, np.ones(1), 0.0)
+
 # -------- CONFIG ------------
 SPARQL_ENDPOINT = os.getenv("DKG_SPARQL_ENDPOINT", "https://euphoria.origin-trail.network/dkg-sparql-query")
 # If you have a DKG Edge Node publish endpoint, set it here. If empty, script will skip publish.
 PUBLISH_URL = os.getenv("DKG_PUBLISH_URL", "")  # e.g. "https://your-edge-node.example/api/publish-knowledge-asset"
 PUBLISH_API_KEY = os.getenv("DKG_PUBLISH_API_KEY", "")  # if your edge-node requires API key, put here
+# Last converged PageRank vector, reused as the starting point of the next run. Set empty to disable.
+PAGERANK_CACHE_PATH = os.getenv("PAGERANK_CACHE_PATH", "./pagerank_cache.npz")
+# Number of assets published concurrently
+PUBLISH_WORKERS = int(os.getenv("DKG_PUBLISH_WORKERS", "16"))
 # -----------------------------
 
 HEADERS = {"Content-Type": "application/json"}
 
+# One pooled session for SPARQL and publish calls: keeps TCP/TLS connections
+# alive across requests instead of a new handshake per POST
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                       max_retries=Retry(total=3, backoff_factor=0.5))
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
 # small helper to run SPARQL
-def run_sparql(query):
-    """Execute a SPARQL query against the DKG endpoint."""
-    resp = requests.post(SPARQL_ENDPOINT, headers=HEADERS, json={"query": query}, timeout=60)
+def run_sparql(query, use_cache=True, max_age=None):
+    """Execute a SPARQL query against the DKG endpoint (served from the local cache when possible)."""
+    return cached_query(SPARQL_ENDPOINT, query, _fetch_sparql, use_cache=use_cache, max_age=max_age)
+
+# Row arrays in the two response shapes handled by _fetch_sparql
+_ROW_PREFIXES = ("data.item", "data.data.item")
+
+def iter_sparql(query):
+    """
+    Yield SPARQL result rows as they are parsed off the wire, without
+    materializing the whole response (falls back to _fetch_sparql without ijson).
+    """
+    if not IJSON_AVAILABLE:
+        yield from _fetch_sparql(query)
+        return
+    with _SESSION.post(SPARQL_ENDPOINT, headers=HEADERS, json={"query": query}, timeout=60, stream=True) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True
+        builder = row_prefix = None
+        for prefix, event, value in ijson.parse(resp.raw, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == row_prefix and event == "end_map":
+                    yield builder.value
+                    builder = None
+            elif prefix in _ROW_PREFIXES and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                row_prefix = prefix
+                builder.event(event, value)
+            elif prefix == "success" and value is False:
+                raise RuntimeError("SPARQL error: success=false")
+
+def _fetch_sparql(query):
+    """POST a SPARQL query to the DKG endpoint and return its result rows."""
+    resp = _SESSION.post(SPARQL_ENDPOINT, headers=HEADERS, json={"query": query}, timeout=60)
     resp.raise_for_status()
-    j = resp.json()
+    j = orjson.loads(resp.content) if ORJSON_AVAILABLE else resp.json()
     if not j.get("success", True):
         raise RuntimeError("SPARQL error: %s" % j)
     # Handle different response formats
@@ -105,128 +209,324 @@ SELECT ?from ?to ?edgeType ?connectionStrength WHERE {
 LIMIT 20000
 """
 
-def build_graph(creators_rows, edges_rows):
-    """Build a NetworkX directed graph from SPARQL results."""
-    G = nx.DiGraph()
-    # add nodes
-    for r in creators_rows:
+class GraphBuilder:
+    """
+    Incremental builder for the creator graph's weighted adjacency matrix.
+    Rows can be fed one at a time (e.g. straight off a streamed SPARQL
+    response); edges go into COO arrays that grow by doubling.
+    """
+
+    def __init__(self, capacity=1024):
+        self.node2idx = {}
+        self.node_meta = {}
+        self._row = np.empty(capacity, dtype=np.int32)
+        self._col = np.empty(capacity, dtype=np.int32)
+        self._w = np.empty(capacity, dtype=np.float64)
+        self._k = 0
+
+    @property
+    def num_edges(self):
+        return self._k
+
+    def add_creator(self, r):
         node = r.get("creator")
-        if not node: continue
-        G.add_node(node, creatorId=r.get("creatorId"), userId=r.get("userId"), name=r.get("name"))
-    # add edges
-    for e in edges_rows:
+        if not node: return
+        self.node2idx.setdefault(node, len(self.node2idx))
+        self.node_meta[node] = {"creatorId": r.get("creatorId"), "userId": r.get("userId"), "name": r.get("name")}
+
+    def add_edge(self, e):
         src = e.get("from")
         dst = e.get("to")
-        if not src or not dst: continue
+        if not src or not dst: return
         # default weight
-        w = 1.0
+        wv = 1.0
         cs = e.get("connectionStrength")
         if cs:
             try:
-                w = float(cs)
-            except:
-                w = 1.0
-        # if nodes not present, still add them
-        if not G.has_node(src): G.add_node(src)
-        if not G.has_node(dst): G.add_node(dst)
-        # increase existing weight if present
-        if G.has_edge(src, dst):
-            G[src][dst]['weight'] = G[src][dst].get('weight', 0.0) + w
-        else:
-            G.add_edge(src, dst, weight=w, edgeType=e.get("edgeType"))
+                wv = float(cs)
+            except (TypeError, ValueError):
+                wv = 1.0
+        if self._k == len(self._w):
+            self._grow()
+        # endpoints not seen yet become nodes
+        k = self._k
+        self._row[k] = self.node2idx.setdefault(src, len(self.node2idx))
+        self._col[k] = self.node2idx.setdefault(dst, len(self.node2idx))
+        self._w[k] = wv
+        self._k = k + 1
+
+    def _grow(self):
+        cap = max(2 * len(self._w), 1)
+        for name in ("_row", "_col", "_w"):
+            old = getattr(self, name)
+            new = np.empty(cap, dtype=old.dtype)
+            new[:self._k] = old[:self._k]
+            setattr(self, name, new)
+
+    def build(self):
+        """Return (A, nodelist, node_meta) as documented on build_graph."""
+        N = len(self.node2idx)
+        k = self._k
+        # repeated (src, dst) pairs are summed when converting to CSR
+        A = scipy.sparse.coo_matrix((self._w[:k], (self._row[:k], self._col[:k])), shape=(N, N)).tocsr()
+        A.sum_duplicates()
+        return A, list(self.node2idx), self.node_meta
+
+def build_graph(creators_rows, edges_rows):
+    """
+    Build the weighted adjacency matrix of the creator graph from SPARQL results.
+    Returns (A, nodelist, node_meta): A is an N x N CSR matrix where
+    A[i, j] is the summed connectionStrength of edges nodelist[i] -> nodelist[j],
+    and node_meta maps creator URIs to their creatorId/userId/name.
+    """
+    builder = GraphBuilder(capacity=len(edges_rows) if hasattr(edges_rows, "__len__") else 1024)
+    for r in creators_rows:
+        builder.add_creator(r)
+    for e in edges_rows:
+        builder.add_edge(e)
+    return builder.build()
+
+def to_networkx(A, nodelist):
+    """
+    DiGraph view of the build_graph output for NetworkX-based scorers.
+    Weights are already aggregated per (src, dst), so edges are bulk-loaded
+    in one add_weighted_edges_from call with no per-edge has_edge checks.
+    """
+    C = A.tocoo()
+    G = nx.DiGraph()
+    G.add_nodes_from(nodelist)
+    G.add_weighted_edges_from(zip([nodelist[i] for i in C.row.tolist()],
+                                  [nodelist[j] for j in C.col.tolist()],
+                                  C.data.tolist()))
     return G
 
-def compute_pagerank(G, alpha=0.85, use_enhanced=True):
+def compute_pagerank(A, nodelist, alpha=0.85, use_enhanced=True, edge_timestamps=None):
     """
-    Compute PageRank on the graph, using weights if present.
-    Optionally uses enhanced temporal PageRank if available.
+    Compute weighted PageRank on the adjacency matrix from build_graph.
+    Uses enhanced temporal PageRank when it is available (edge_timestamps,
+    {(src, dst): datetime}, are passed on to it for recency weighting).
     """
-    # Try to use enhanced temporal PageRank if available
-    if use_enhanced:
-        try:
-            import sys
-            import os
-            # Add services/reputation to path
-            sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'services', 'reputation'))
-            from enhanced_pagerank import TemporalPageRank
-            
-            temporal_pr = TemporalPageRank(alpha=alpha)
-            return temporal_pr.compute(G)
-        except ImportError:
-            # Fall back to standard PageRank
-            pass
+    if use_enhanced and _TEMPORAL is not None:
+        return _TEMPORAL(alpha=alpha).compute(to_networkx(A, nodelist), edge_timestamps=edge_timestamps)
     
-    # Use weights if present
-    if any('weight' in G[u][v] for u,v in G.edges()):
-        pr = nx.pagerank(G, alpha=alpha, weight='weight')
+    if IGRAPH_AVAILABLE:
+        pr = igraph_pagerank(A, nodelist, alpha=alpha)
     else:
-        pr = nx.pagerank(G, alpha=alpha)
+        # Seed from the previous converged vector: the DKG graph changes little
+        # between polls, so this needs far fewer iterations than a uniform start.
+        pr = pagerank_csr(A, nodelist, alpha=alpha, nstart=_load_last_pagerank())
+    _save_last_pagerank(pr)
     return pr
 
+def igraph_pagerank(A, nodelist, alpha=0.85):
+    """Weighted PageRank of the build_graph adjacency matrix using igraph's PRPACK solver."""
+    if not nodelist:
+        return {}
+    C = A.tocoo()
+    g = igraph.Graph(n=len(nodelist), edges=list(zip(C.row.tolist(), C.col.tolist())), directed=True)
+    g.es["weight"] = C.data.tolist()
+    pr = g.pagerank(weights="weight", damping=alpha, directed=True, implementation="prpack")
+    return dict(zip(nodelist, pr))
+
+# {node: score} from the last converged run (in-process, backed by PAGERANK_CACHE_PATH)
+_LAST_PR = None
+
+def _load_last_pagerank():
+    """Return the previous PageRank vector, loading it from disk on first use."""
+    global _LAST_PR
+    if _LAST_PR is None and PAGERANK_CACHE_PATH and os.path.exists(PAGERANK_CACHE_PATH):
+        try:
+            with np.load(PAGERANK_CACHE_PATH) as cache:
+                _LAST_PR = dict(zip(cache["nodelist"].tolist(), cache["x"].tolist()))
+        except (OSError, KeyError, ValueError) as exc:
+            print(f"[pagerank] ignoring unreadable cache {PAGERANK_CACHE_PATH}: {exc}")
+    return _LAST_PR
+
+def _save_last_pagerank(pr):
+    """Remember a converged PageRank vector and persist it for the next process."""
+    global _LAST_PR
+    _LAST_PR = pr
+    if not PAGERANK_CACHE_PATH or not pr:
+        return
+    try:
+        np.savez(PAGERANK_CACHE_PATH,
+                 nodelist=np.array([str(n) for n in pr]),
+                 x=np.fromiter(pr.values(), dtype=np.float64, count=len(pr)))
+    except OSError as exc:
+        print(f"[pagerank] could not write cache {PAGERANK_CACHE_PATH}: {exc}")
+
+def sparse_pagerank(G, alpha=0.85, max_iter=200, tol=1.0e-6, weight='weight', nstart=None):
+    """
+    PageRank of a NetworkX graph via pagerank_csr. Edges without a weight
+    count as 1.0, same as nx.pagerank.
+    """
+    nodelist = list(G.nodes())
+    A = nx.to_scipy_sparse_array(G, nodelist=nodelist, weight=weight, dtype=np.float64, format='csr')
+    return pagerank_csr(A, nodelist, alpha=alpha, max_iter=max_iter, tol=tol, nstart=nstart)
+
+def pagerank_csr(A, nodelist, alpha=0.85, max_iter=200, tol=1.0e-6, nstart=None):
+    """
+    PageRank by power iteration over the row-normalized CSR adjacency matrix.
+    Same semantics as nx.pagerank (dangling mass spread uniformly), except
+    that convergence is an absolute L1 tolerance: networkx's err < N*tol
+    stops after the first step on large sparse graphs and returns a nearly
+    uniform vector.
+    nstart: optional {node: score} starting vector; nodes missing from it
+    start at 1/N and the vector is renormalized to sum to 1.
+    """
+    N = len(nodelist)
+    if N == 0:
+        return {}
+    # Row-normalize with a diagonal scaling (C-level, no per-entry Python loop)
+    S = np.asarray(A.sum(axis=1)).ravel()
+    has_out = S != 0
+    inv = np.zeros_like(S)
+    inv[has_out] = 1.0 / S[has_out]
+    M = (scipy.sparse.diags(inv) @ A).T.tocsr()
+    dangling = np.flatnonzero(~has_out)
+
+    p = np.full(N, 1.0 / N)
+    if nstart:
+        x = np.fromiter((nstart.get(n, 1.0 / N) for n in nodelist), dtype=np.float64, count=N)
+        x /= x.sum()
+    else:
+        x = p.copy()
+    if NUMBA_AVAILABLE:
+        indptr = M.indptr.astype(np.int32, copy=False)
+        indices = M.indices.astype(np.int32, copy=False)
+        data = M.data.astype(np.float64, copy=False)
+        x_out = np.empty(N)
+        for _ in range(max_iter):
+            _spmv_pr(indptr, indices, data, x, x_out, alpha, p, x[dangling].sum())
+            err = np.abs(x_out - x).sum()
+            x, x_out = x_out, x
+            if err < tol:
+                return dict(zip(nodelist, x.tolist()))
+        raise nx.PowerIterationFailedConvergence(max_iter)
+
+    for _ in range(max_iter):
+        xlast = x
+        x = alpha * (M @ x + xlast[dangling].sum() * p) + (1 - alpha) * p
+        err = np.abs(x - xlast).sum()
+        if err < tol:
+            return dict(zip(nodelist, x.tolist()))
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+# Shared by every asset: identical for all creators and never mutated, so
+# it is built once instead of per make_reputation_asset call
+_CTX = {
+  "schema": "https://schema.org/",
+  "prov": "http://www.w3.org/ns/prov#"
+}
+
+# Random bytes for asset UUIDs, drawn from os.urandom in bulk rather than
+# one 16-byte syscall per uuid4 call
+_UUID_POOL_SIZE = 1 << 16
+_UUID_POOL = b""
+_UUID_OFF = 0
+_UUID_LOCK = threading.Lock()
+
+def _next_uuid():
+    """Random (version 4) UUID string sliced from the shared urandom pool."""
+    global _UUID_POOL, _UUID_OFF
+    with _UUID_LOCK:
+        if _UUID_OFF + 16 > len(_UUID_POOL):
+            _UUID_POOL = os.urandom(_UUID_POOL_SIZE)
+            _UUID_OFF = 0
+        b = _UUID_POOL[_UUID_OFF:_UUID_OFF + 16]
+        _UUID_OFF += 16
+    return str(UUID(bytes=b, version=4))
+
 def make_reputation_asset(creator_uri, pagerank_score, stake_weight=None, timestamp=None):
     """Generate a JSON-LD Reputation Asset for a creator."""
     if timestamp is None:
         timestamp = datetime.now(timezone.utc).isoformat()
-    asset = {
-      "@context": {
-        "schema": "https://schema.org/",
-        "prov": "http://www.w3.org/ns/prov#"
-      },
+    props = [
+      { "@type": "schema:PropertyValue", "schema:name":"pageRankScore", "schema:value": pagerank_score },
+      { "@type": "schema:PropertyValue", "schema:name":"lastUpdated",   "schema:value": timestamp }
+    ]
+    if stake_weight is not None:
+        props.append({"@type":"schema:PropertyValue","schema:name":"stakeWeight","schema:value":stake_weight})
+    return {
+      "@context": _CTX,
       "@graph": [
         {
           "@type": "schema:Dataset",
-          "@id": f"urn:rep:{uuid4()}",
+          "@id": f"urn:rep:{_next_uuid()}",
           "schema:name": f"Reputation snapshot for {creator_uri}",
           "schema:datePublished": timestamp,
           "schema:about": {"@id": creator_uri},
-          "schema:additionalProperty": [
-            { "@type": "schema:PropertyValue", "schema:name":"pageRankScore", "schema:value": pagerank_score },
-            { "@type": "schema:PropertyValue", "schema:name":"lastUpdated",   "schema:value": timestamp }
-          ],
-          "prov:wasDerivedFrom": [ { "@id": f"urn:calc:{uuid4()}" } ]
+          "schema:additionalProperty": props,
+          "prov:wasDerivedFrom": [ { "@id": f"urn:calc:{_next_uuid()}" } ]
         }
       ]
     }
-    if stake_weight is not None:
-        asset["@graph"][0]["schema:additionalProperty"].append(
-            {"@type":"schema:PropertyValue","schema:name":"stakeWeight","schema:value":stake_weight}
-        )
-    return asset
 
-def publish_asset(json_ld):
-    """Publish a JSON-LD asset to the DKG Edge Node."""
+_PUBLISH_HEADERS = {"Content-Type":"application/ld+json"}
+if PUBLISH_API_KEY:
+    _PUBLISH_HEADERS["Authorization"] = f"Bearer {PUBLISH_API_KEY}"
+
+def publish_asset(json_ld, *, parse_response=False):
+    """
+    Publish a JSON-LD asset to the DKG Edge Node.
+    Returns the HTTP status code, or the decoded response body when
+    parse_response=True (skipped by default since callers only log it).
+    """
     if not PUBLISH_URL:
         print("[publish] PUBLISH_URL not set — skipping publish. Save JSON-LD locally instead.")
         return None
-    headers = {"Content-Type":"application/ld+json"}
-    if PUBLISH_API_KEY:
-        headers["Authorization"] = f"Bearer {PUBLISH_API_KEY}"
-    r = requests.post(PUBLISH_URL, headers=headers, json=json_ld, timeout=60)
+    r = _SESSION.post(PUBLISH_URL, headers=_PUBLISH_HEADERS, json=json_ld, timeout=60)
     r.raise_for_status()
-    return r.json()
+    return r.json() if parse_response else r.status_code
+
+def publish_or_save(uri, asset):
+    """Publish one asset, or write it locally when no PUBLISH_URL is configured."""
+    res = publish_asset(asset)
+    if res is not None:
+        return "published", res
+    # write locally
+    safe_uri = uri.split('/')[-1].replace(':', '_').replace('#', '_')
+    fname = f"./reputation_{safe_uri}_{int(time.time())}.jsonld"
+    if ORJSON_AVAILABLE:
+        Path(fname).write_bytes(orjson.dumps(asset, option=orjson.OPT_INDENT_2))
+    else:
+        with open(fname, "w") as fh:
+            json.dump(asset, fh, indent=2)
+    return "saved", fname
 
 def main():
+    parser = argparse.ArgumentParser(description="Compute and publish DKG reputation assets")
+    add_cache_args(parser)
+    args = parser.parse_args()
+    use_cache = not args.no_cache
+
+    builder = GraphBuilder()
     print("[*] fetching creators...")
-    creators = run_sparql(QUERY_CREATORS)
+    creators = run_sparql(QUERY_CREATORS, use_cache, args.max_age)
+    for r in creators:
+        builder.add_creator(r)
     print(f" -> creators returned: {len(creators)}")
 
     print("[*] fetching edges...")
-    edges = run_sparql(QUERY_EDGES)
-    print(f" -> edges returned: {len(edges)}")
+    # Uncached runs stream edge rows straight into the graph builder
+    edges = run_sparql(QUERY_EDGES, use_cache, args.max_age) if use_cache else iter_sparql(QUERY_EDGES)
+    for e in edges:
+        builder.add_edge(e)
+    print(f" -> edges added: {builder.num_edges}")
 
-    G = build_graph(creators, edges)
-    print(f"Graph nodes: {G.number_of_nodes()}, edges: {G.number_of_edges()}")
+    A, nodelist, node_meta = builder.build()
+    print(f"Graph nodes: {len(nodelist)}, edges: {A.nnz}")
 
     print("[*] computing PageRank...")
-    pr = compute_pagerank(G)
+    pr = compute_pagerank(A, nodelist)
 
     # map to creators and generate assets
     outputs = []
     for node_uri, score in pr.items():
-        node_meta = G.nodes.get(node_uri, {})
-        creatorId = node_meta.get("creatorId")
+        meta = node_meta.get(node_uri, {})
+        creatorId = meta.get("creatorId")
         # try to read stake from node metadata if you stored it earlier (placeholder)
-        stake_weight = node_meta.get("stakeWeight")
+        stake_weight = meta.get("stakeWeight")
         asset = make_reputation_asset(node_uri, float(score), stake_weight)
         outputs.append((node_uri, score, asset))
 
@@ -236,24 +536,24 @@ def main():
     for uri,score,asset in top:
         print(f" - {uri} : {score:.6f}")
 
-    # publish or store
+    # publish or store, several assets in flight at once over the pooled session
     print("\n[*] Publishing reputation assets...")
-    for uri, score, asset in outputs:
-        # pretty print small summary
-        print(f"Publishing reputation for {uri} score={score:.6f}")
-        try:
-            res = publish_asset(asset)
-            if res is None:
-                # write locally
-                safe_uri = uri.split('/')[-1].replace(':', '_').replace('#', '_')
-                fname = f"./reputation_{safe_uri}_{int(time.time())}.jsonld"
-                with open(fname, "w") as fh:
-                    json.dump(asset, fh, indent=2)
-                print("  saved ->", fname)
-            else:
-                print("  publish response:", res)
-        except Exception as exc:
-            print("  publish failed:", exc)
+    with ThreadPoolExecutor(max_workers=PUBLISH_WORKERS) as ex:
+        futures = {ex.submit(publish_or_save, uri, asset): (uri, score) for uri, score, asset in outputs}
+        for fut in as_completed(futures):
+            uri, score = futures[fut]
+            # pretty print small summary
+            print(f"Reputation for {uri} score={score:.6f}")
+            try:
+                kind, value = fut.result()
+                if kind == "saved":
+                    print("  saved ->", value)
+                elif isinstance(value, int):
+                    print(f"  published (HTTP {value})")
+                else:
+                    print("  publish response:", value)
+            except Exception as exc:
+                print("  publish failed:", exc)
 
 if __name__ == "__main__":
     main()
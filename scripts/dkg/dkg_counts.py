@@ -6,17 +6,35 @@ dkg_counts.py
 - Helps determine dataset size for reputation computation
 """
 
+import argparse
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import sys
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sparql_cache import cached_query, add_cache_args
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 ENDPOINT = os.getenv("DKG_SPARQL_ENDPOINT", "https://euphoria.origin-trail.network/dkg-sparql-query")
 HEADERS = {"Content-Type": "application/json"}
 
+# Pooled session: all COUNT queries reuse the same keep-alive connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=8,
+                       max_retries=Retry(total=3, backoff_factor=0.5))
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
 QUERIES = {
   "creatorCount": """PREFIX schema: <https://schema.org/> PREFIX foaf: <http://xmlns.com/foaf/0.1/> PREFIX prov: <http://www.w3.org/ns/prov#> SELECT (COUNT(DISTINCT ?creator) AS ?creatorCount) WHERE { ?creator a schema:Person, foaf:Person, prov:Agent . }""",
   "postCount": """PREFIX schema: <https://schema.org/> SELECT (COUNT(DISTINCT ?post) AS ?postCount) WHERE { ?post a schema:SocialMediaPosting . }""",
@@ -24,11 +42,15 @@ QUERIES = {
   "creatorsByPlatform": """PREFIX schema: <https://schema.org/> SELECT ?platform (COUNT(DISTINCT ?creator) AS ?count) WHERE { ?creator a schema:Person . ?creator schema:identifier ?idObj . ?idObj schema:propertyID "platform" ; schema:value ?platform . } GROUP BY ?platform ORDER BY DESC(?count)"""
 }
 
-def run_query(q):
-    """Execute a SPARQL query and return results."""
-    r = requests.post(ENDPOINT, headers=HEADERS, json={"query": q}, timeout=60)
+def run_query(q, use_cache=True, max_age=None):
+    """Execute a SPARQL query and return results (served from the local cache when possible)."""
+    return cached_query(ENDPOINT, q, _fetch_query, use_cache=use_cache, max_age=max_age)
+
+def _fetch_query(q):
+    """POST a SPARQL query to the endpoint and return its result rows."""
+    r = _SESSION.post(ENDPOINT, headers=HEADERS, json={"query": q}, timeout=60)
     r.raise_for_status()
-    j = r.json()
+    j = orjson.loads(r.content) if ORJSON_AVAILABLE else r.json()
     if not j.get("success", True):
         raise RuntimeError("SPARQL endpoint error: %s" % j)
     # Handle different response formats
@@ -40,21 +62,29 @@ def run_query(q):
     return j.get("data", [])
 
 def main():
+    parser = argparse.ArgumentParser(description="Scan DKG dataset statistics")
+    add_cache_args(parser)
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("OriginTrail DKG Data Scan")
     print("=" * 60)
     print(f"Endpoint: {ENDPOINT}\n")
     
+    # The COUNT queries are independent, so run them concurrently:
+    # wall time is the slowest query instead of the sum of all of them
     results = {}
-    for key, q in QUERIES.items():
-        print(f"Running: {key}...", end=" ")
-        try:
-            data = run_query(q)
-            results[key] = data
-            print("✓")
-        except Exception as e:
-            print(f"✗ Error: {e}")
-            results[key] = None
+    with ThreadPoolExecutor(max_workers=len(QUERIES)) as ex:
+        futures = {ex.submit(run_query, q, not args.no_cache, args.max_age): key
+                   for key, q in QUERIES.items()}
+        for f in as_completed(futures):
+            key = futures[f]
+            try:
+                results[key] = f.result()
+                print(f"Running: {key}... ✓")
+            except Exception as e:
+                print(f"Running: {key}... ✗ Error: {e}")
+                results[key] = None
     
     # Pretty print counts
     print("\n" + "=" * 60)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+sparql_cache.py
+- Content-addressed on-disk cache for SPARQL result rows
+- Keyed by SHA-256 of endpoint URL + query text, one file per query
+- Used by dkg_counts.py and compute_and_publish_reps.py so repeated runs
+  skip the network fetch (disable with --no-cache, bound with --max-age)
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+CACHE_DIR = Path(os.getenv("DKG_CACHE_DIR", "~/.cache/dkg")).expanduser()
+
+# rows already loaded or fetched in this process, by cache key
+_MEMORY = {}
+
+def cache_key(endpoint, query):
+    """SHA-256 hex digest identifying a (endpoint, query) pair."""
+    return hashlib.sha256((endpoint + query).encode("utf-8")).hexdigest()
+
+def _cache_path(key):
+    suffix = ".json.zst" if ZSTD_AVAILABLE else ".json"
+    return CACHE_DIR / f"{key}{suffix}"
+
+def _dumps(rows):
+    data = orjson.dumps(rows) if ORJSON_AVAILABLE else json.dumps(rows).encode("utf-8")
+    return zstandard.ZstdCompressor().compress(data) if ZSTD_AVAILABLE else data
+
+def _loads(blob):
+    if ZSTD_AVAILABLE:
+        blob = zstandard.ZstdDecompressor().decompress(blob)
+    return orjson.loads(blob) if ORJSON_AVAILABLE else json.loads(blob)
+
+def cached_query(endpoint, query, fetch, use_cache=True, max_age=None):
+    """
+    Return the rows for `query`, calling fetch(query) only on a cache miss.
+    max_age: ignore cached files older than this many seconds (None = no limit).
+    """
+    if not use_cache:
+        return fetch(query)
+    key = cache_key(endpoint, query)
+    if key in _MEMORY:
+        return _MEMORY[key]
+
+    path = _cache_path(key)
+    try:
+        if max_age is None or time.time() - path.stat().st_mtime <= max_age:
+            rows = _loads(path.read_bytes())
+            _MEMORY[key] = rows
+            return rows
+    except FileNotFoundError:
+        pass
+    except Exception as exc:
+        print(f"[cache] ignoring unreadable entry {path}: {exc}")
+
+    rows = fetch(query)
+    _MEMORY[key] = rows
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(_dumps(rows))
+        os.replace(tmp, path)
+    except OSError as exc:
+        print(f"[cache] could not write {path}: {exc}")
+    return rows
+
+def add_cache_args(parser):
+    """Register the --no-cache / --max-age options on an argparse parser."""
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always query the SPARQL endpoint, bypassing the local result cache")
+    parser.add_argument("--max-age", type=float, default=None,
+                        help="Refetch cached SPARQL results older than this many seconds")
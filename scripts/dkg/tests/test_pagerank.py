@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Unit tests for DKG PageRank computation
+"""
+
+import sys
+from pathlib import Path
+
+import networkx as nx
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from compute_and_publish_reps import sparse_pagerank
+
+
+def test_pagerank_converges_on_large_sparse_graph():
+    """A 2000-node graph with 2 edges must not stop at the near-uniform first iterate"""
+    G = nx.DiGraph()
+    G.add_nodes_from(range(2000))
+    G.add_edge(0, 1)
+    G.add_edge(1, 2)
+    
+    pr = sparse_pagerank(G)
+    reference = nx.pagerank(G, tol=1e-14, max_iter=1000)
+    
+    assert pr[2] > pr[1] > pr[0]
+    for node in (0, 1, 2):
+        assert abs(pr[node] - reference[node]) < 1e-8
+    assert abs(sum(pr.values()) - 1.0) < 1e-9
+
+
+if __name__ == "__main__":
+    test_pagerank_converges_on_large_sparse_graph()
+    print("✓ PageRank convergence test passed")
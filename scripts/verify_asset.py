@@ -8,17 +8,23 @@ import json
 import sys
 import argparse
 import requests
-import hashlib
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
+
+# Canonical encoding and digest shared with the publisher, so both hash identical bytes
+sys.path.insert(0, str(Path(__file__).parent.parent / "services" / "ingest"))
+from canonical_json import BLAKE3_AVAILABLE, HASH_ALGOS, canonical_digest
 
-# Try to import verification libraries
 try:
-    from canonicaljson import encode_canonical_json
-    CANONICAL_JSON = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    CANONICAL_JSON = False
+    ORJSON_AVAILABLE = False
 
 try:
     from cryptography.hazmat.primitives import serialization
@@ -28,13 +34,15 @@ try:
 except ImportError:
     CRYPTO_AVAILABLE = False
 
-
-def canonicalize_json(data: Dict[str, Any]) -> bytes:
-    """Canonicalize JSON for deterministic hashing"""
-    if CANONICAL_JSON:
-        return encode_canonical_json(data)
-    else:
-        return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+# Shared keep-alive session so repeated calls reuse pooled TCP/TLS connections
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2)
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
 
 
 def verify_content_hash(asset: Dict[str, Any]) -> tuple[bool, str]:
@@ -42,12 +50,16 @@ def verify_content_hash(asset: Dict[str, Any]) -> tuple[bool, str]:
     if 'contentHash' not in asset:
         return False, "Missing contentHash"
     
-    # Remove hash and signature before computing
-    asset_copy = asset.copy()
-    asset_copy.pop('contentHash', None)
-    asset_copy.pop('signature', None)
+    hash_algo = asset.get('hashAlgo', 'sha-256')
+    if hash_algo not in HASH_ALGOS:
+        return False, f"Unsupported hashAlgo: {hash_algo}"
+    if hash_algo == 'blake3' and not BLAKE3_AVAILABLE:
+        return False, "hashAlgo is blake3 but the blake3 package is not installed"
+    
+    # Hash everything except the hash and signature themselves
+    unsigned = {k: v for k, v in asset.items() if k not in ('contentHash', 'signature')}
     
-    computed_hash = hashlib.sha256(canonicalize_json(asset_copy)).hexdigest()
+    computed_hash = canonical_digest(unsigned, hash_algo)
     stored_hash = asset['contentHash']
     
     if computed_hash == stored_hash:
@@ -88,7 +100,7 @@ def verify_anchor(ual: str, edge_url: Optional[str] = None) -> tuple[bool, str]:
     
     try:
         # Query edge node for asset
-        response = requests.get(f"{edge_url}/asset/{ual}", timeout=10)
+        response = SESSION.get(f"{edge_url}/asset/{ual}", timeout=10)
         if response.status_code == 200:
             return True, f"Asset found on edge node"
         else:
@@ -100,11 +112,23 @@ def verify_anchor(ual: str, edge_url: Optional[str] = None) -> tuple[bool, str]:
 def verify_asset(
     asset_path: str,
     edge_url: Optional[str] = None,
-    public_key_path: Optional[str] = None
+    public_key_path: Optional[str] = None,
+    *,
+    parsed: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
-    """Verify a Knowledge Asset"""
-    with open(asset_path, 'r') as f:
-        asset = json.load(f)
+    """
+    Verify a Knowledge Asset
+    
+    Callers that already parsed the file can pass the `parsed` document to
+    skip reading and parsing it again.
+    """
+    if parsed is not None:
+        asset = parsed
+    elif ORJSON_AVAILABLE:
+        asset = orjson.loads(Path(asset_path).read_bytes())
+    else:
+        with open(asset_path, 'r') as f:
+            asset = json.load(f)
     
     ual = asset.get('id', asset.get('ual', 'unknown'))
     
@@ -127,15 +151,50 @@ def verify_asset(
     }
 
 
+def verify_batch(
+    asset_paths: List[str],
+    edge_url: Optional[str] = None,
+    public_key_path: Optional[str] = None,
+    max_workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Verify many asset files concurrently, returning results in input order
+    
+    hashlib releases the GIL while hashing large buffers, so hashing and
+    file/anchor I/O overlap across worker threads.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        return list(ex.map(lambda path: verify_asset(path, edge_url, public_key_path), asset_paths))
+
+
 def main():
     parser = argparse.ArgumentParser(description="Verify Knowledge Assets")
-    parser.add_argument("asset", type=str, help="Path to asset JSON file or UAL")
+    parser.add_argument("asset", type=str, nargs='+', help="Path(s) to asset JSON file(s), or a single UAL")
     parser.add_argument("--edge-url", type=str, default=None, help="Edge Node URL for anchor verification")
     parser.add_argument("--public-key", type=str, help="Path to public key for signature verification")
     parser.add_argument("--format", choices=['json', 'text'], default='text', help="Output format")
     
     args = parser.parse_args()
     
+    # Several asset files: verify them concurrently
+    if len(args.asset) > 1:
+        if any(a.startswith('urn:ual:') for a in args.asset):
+            print("Error: UALs can only be verified one at a time", file=sys.stderr)
+            return 1
+        results = verify_batch(args.asset, args.edge_url, args.public_key)
+        if args.format == 'json':
+            if ORJSON_AVAILABLE:
+                print(orjson.dumps(results, option=orjson.OPT_INDENT_2).decode('utf-8'))
+            else:
+                print(json.dumps(results, indent=2))
+        else:
+            for path, result in zip(args.asset, results):
+                print(f"{'✓' if result['overall_valid'] else '✗'} {path} ({result['ual']}): "
+                      f"{result['hash_message']}; {result['signature_message']}")
+        return 0 if all(r['overall_valid'] for r in results) else 1
+    
+    args.asset = args.asset[0]
+    
     # If UAL provided, try to fetch from edge node
     if args.asset.startswith('urn:ual:'):
         if not args.edge_url:
@@ -143,7 +202,7 @@ def main():
             return 1
         
         try:
-            response = requests.get(f"{args.edge_url}/asset/{args.asset}", timeout=10)
+            response = SESSION.get(f"{args.edge_url}/asset/{args.asset}", timeout=10)
             if response.status_code != 200:
                 print(f"Error: Asset not found: {args.asset}", file=sys.stderr)
                 return 1
@@ -151,8 +210,11 @@ def main():
             asset = response.json()
             # Save to temp file for verification
             import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                json.dump(asset, f)
+            with tempfile.NamedTemporaryFile(mode='wb', suffix='.json', delete=False) as f:
+                if ORJSON_AVAILABLE:
+                    f.write(orjson.dumps(asset))
+                else:
+                    f.write(json.dumps(asset).encode('utf-8'))
                 asset_path = f.name
         except Exception as e:
             print(f"Error fetching asset: {e}", file=sys.stderr)
@@ -163,7 +225,10 @@ def main():
     result = verify_asset(asset_path, args.edge_url, args.public_key)
     
     if args.format == 'json':
-        print(json.dumps(result, indent=2))
+        if ORJSON_AVAILABLE:
+            print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode('utf-8'))
+        else:
+            print(json.dumps(result, indent=2))
     else:
         print(f"UAL: {result['ual']}")
         print(f"Type: {result['type']}")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+canonical_json.py
+- The single canonical JSON encoding that asset contentHash values are computed over
+- Shared by publish_sample_asset.py (publisher) and scripts/verify_asset.py (verifier)
+  so both sides hash the same bytes on every host, whatever optional packages are installed
+"""
+
+import hashlib
+import json
+import sys
+from typing import Any, Dict
+
+# BLAKE3 is an opt-in alternative content hash (assets declare it with
+# "hashAlgo": "blake3"; SIMD, much faster than SHA-256 without SHA hardware)
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# hashlib dispatches SHA-256 to OpenSSL (SHA-NI / ARMv8 CE accelerated) when it
+# is linked in; otherwise CPython falls back to its builtin scalar implementation.
+# Warn on stderr so the JSON that importing CLIs write to stdout stays clean
+SHA256_OPENSSL = getattr(hashlib.sha256, "__name__", "") == "openssl_sha256"
+if not SHA256_OPENSSL:
+    print("Warning: hashlib is not OpenSSL-backed, SHA-256 will not be hardware accelerated", file=sys.stderr)
+
+# The canonical encoding: sorted keys, no whitespace, UTF-8 (non-ASCII not
+# escaped), Python repr for floats, arbitrary-size ints, NaN/Infinity rejected.
+# This is exactly what canonicaljson.encode_canonical_json emits. Do not swap in
+# orjson/rapidjson here: they format floats differently (1e-7 vs 1e-07) and
+# reject ints beyond 64 bits, which would change or break content hashes.
+_CANONICAL_ENCODER = json.JSONEncoder(
+    sort_keys=True,
+    separators=(',', ':'),
+    ensure_ascii=False,
+    allow_nan=False
+)
+
+# Encoder chunks are tiny; feed them to the hash in blocks of this size
+_HASH_BLOCK_SIZE = 64 * 1024
+
+HASH_ALGOS = ("sha-256", "blake3")
+
+
+def canonicalize_json(data: Dict[str, Any]) -> bytes:
+    """Canonicalize JSON for deterministic hashing"""
+    return _CANONICAL_ENCODER.encode(data).encode('utf-8')
+
+
+def canonical_digest(data: Dict[str, Any], hash_algo: str = "sha-256") -> str:
+    """
+    Hex digest of canonicalize_json(data) with SHA-256 (default) or BLAKE3
+
+    The encoding is streamed into the hash block by block instead of
+    materializing the whole canonical document first.
+    """
+    if hash_algo == "blake3":
+        if not BLAKE3_AVAILABLE:
+            raise RuntimeError("hash_algo 'blake3' requires the blake3 package")
+        h = blake3.blake3()
+    elif hash_algo == "sha-256":
+        h = hashlib.sha256()
+    else:
+        raise ValueError(f"Unsupported hash_algo: {hash_algo}")
+
+    block = []
+    size = 0
+    for chunk in _CANONICAL_ENCODER.iterencode(data):
+        block.append(chunk)
+        size += len(chunk)
+        if size >= _HASH_BLOCK_SIZE:
+            h.update(''.join(block).encode('utf-8'))
+            block = []
+            size = 0
+    h.update(''.join(block).encode('utf-8'))
+    return h.hexdigest()
@@ -5,23 +5,29 @@ Converts source CSV/JSON → structured JSON-LD Knowledge Assets and publishes t
 """
 
 import json
-import hashlib
 import base64
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
+import asyncio
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 
-# Try to import canonicaljson, fallback to json.dumps with sorted keys
+from canonical_json import HASH_ALGOS, canonical_digest
+
+# orjson parses templates/stdin and writes CLI output (never the hashed bytes)
 try:
-    from canonicaljson import encode_canonical_json
-    CANONICAL_JSON = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    CANONICAL_JSON = False
-    print("Warning: canonicaljson not installed, using json.dumps with sorted keys")
+    ORJSON_AVAILABLE = False
 
 # Try to import cryptography for signing
 try:
@@ -33,43 +39,111 @@ except ImportError:
     CRYPTO_AVAILABLE = False
     print("Warning: cryptography not installed, signatures will be simulated")
 
+# httpx provides the async client used for concurrent batch publishing
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
 
-def canonicalize_json(data: Dict[str, Any]) -> bytes:
-    """Canonicalize JSON for deterministic hashing"""
-    if CANONICAL_JSON:
-        return encode_canonical_json(data)
-    else:
-        # Fallback: sort keys and use compact JSON
-        return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+# Retries for failed connection attempts. A POST publish is never resent once
+# the request has gone out: a gateway 502/504 may arrive after the Edge Node
+# already processed it, and nothing guarantees publishes are deduplicated by id
+PUBLISH_RETRIES = 3
 
+# Shared keep-alive session so repeated calls reuse pooled TCP/TLS connections.
+# pool_maxsize matches publish_many's default concurrency
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=PUBLISH_RETRIES, backoff_factor=0.2)
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
 
-def compute_content_hash(payload: Dict[str, Any]) -> str:
-    """Compute SHA-256 hash of canonicalized JSON"""
-    payload_bytes = canonicalize_json(payload)
-    return hashlib.sha256(payload_bytes).hexdigest()
 
+def compute_content_hash(payload: Dict[str, Any], hash_algo: str = "sha-256") -> str:
+    """Compute SHA-256 (default) or BLAKE3 hash of canonicalized JSON (see canonical_json.py)"""
+    return canonical_digest(payload, hash_algo)
 
-def sign_with_ed25519(data: bytes, private_key_path: Optional[str] = None) -> str:
-    """Sign data with Ed25519 private key"""
-    if not CRYPTO_AVAILABLE:
-        # Simulate signature for demo
-        return base64.b64encode(b"SIMULATED_SIGNATURE_" + data[:16]).decode()
+
+@lru_cache(maxsize=8)
+def load_signing_key(private_key_path: Optional[str] = None):
+    """
+    Load an Ed25519 private key, once per path
     
+    Without a readable key file a temporary demo key is generated; it is cached
+    too, so every asset signed in this process uses the same key.
+    """
     if private_key_path and os.path.exists(private_key_path):
         with open(private_key_path, 'rb') as f:
-            private_key = serialization.load_pem_private_key(
+            return serialization.load_pem_private_key(
                 f.read(),
                 password=None,
                 backend=default_backend()
             )
-    else:
-        # Generate a temporary key for demo
-        private_key = ed25519.Ed25519PrivateKey.generate()
+    # Generate a temporary key for demo
+    return ed25519.Ed25519PrivateKey.generate()
+
+
+def sign_with_ed25519(data: bytes, private_key_path: Optional[str] = None, private_key=None) -> str:
+    """Sign data with Ed25519 private key (pass `private_key` to skip the key lookup)"""
+    if not CRYPTO_AVAILABLE:
+        # Simulate signature for demo
+        return base64.b64encode(b"SIMULATED_SIGNATURE_" + data[:16]).decode()
+    
+    if private_key is None:
+        private_key = load_signing_key(private_key_path)
     
     signature = private_key.sign(data)
     return base64.b64encode(signature).decode()
 
 
+# Compact UTC timestamp embedded in asset ids
+UAL_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+def utc_isoformat(now: Optional[datetime] = None) -> str:
+    """ISO 8601 UTC timestamp with a Z suffix (defaults to the current time)"""
+    if now is None:
+        now = datetime.now(timezone.utc)
+    return now.replace(tzinfo=None).isoformat() + "Z"
+
+
+# {{name}} placeholders in JSON-LD templates
+TEMPLATE_RE = re.compile(r"\{\{(\w+)\}\}")
+
+# Unquoted {{name}} placeholders standing in for a whole JSON value (numbers, lists)
+BARE_PLACEHOLDER_RE = re.compile(r'("\s*:\s*)(\{\{\w+\}\})')
+
+
+class _TemplateVariables(dict):
+    """format_map mapping that leaves unknown {{name}} placeholders as-is"""
+    def __missing__(self, key: str) -> str:
+        return "{{" + key + "}}"
+
+
+@lru_cache(maxsize=1024)
+def _format_spec(content: str) -> str:
+    """Translate a {{name}} template string to a str.format_map pattern (cached per string)"""
+    parts = TEMPLATE_RE.split(content)
+    # split() alternates literal text and placeholder names
+    for i in range(0, len(parts), 2):
+        parts[i] = parts[i].replace("{", "{{").replace("}", "}}")
+    for i in range(1, len(parts), 2):
+        parts[i] = "{" + parts[i] + "}"
+    return "".join(parts)
+
+
+def render_template(content: str, variables: Dict[str, Any]) -> str:
+    """Substitute {{name}} placeholders in a single pass (unknown ones are left as-is)"""
+    if not isinstance(variables, _TemplateVariables):
+        variables = _TemplateVariables(variables)
+    return _format_spec(content).format_map(variables)
+
+
+@lru_cache(maxsize=None)
 def load_template(template_name: str) -> str:
     """Load JSON-LD template"""
     template_path = Path(__file__).parent.parent.parent / "templates" / f"{template_name}.jsonld"
@@ -78,6 +152,63 @@ def load_template(template_name: str) -> str:
     return template_path.read_text()
 
 
+@lru_cache(maxsize=None)
+def load_template_parsed(template_name: str) -> Dict[str, Any]:
+    """
+    Load and parse a JSON-LD template once
+    
+    Bare value placeholders are quoted so the template is valid JSON; the
+    result is shared between calls and must not be mutated (use fill_template).
+    """
+    quoted = BARE_PLACEHOLDER_RE.sub(r'\1"\2"', load_template(template_name))
+    return orjson.loads(quoted) if ORJSON_AVAILABLE else json.loads(quoted)
+
+
+def fill_template(node: Any, variables: Dict[str, Any]) -> Any:
+    """
+    Copy a parsed template, substituting {{name}} placeholders
+    
+    A string that is exactly one known placeholder is replaced by the variable
+    itself (keeping numbers and lists typed); placeholders embedded in longer
+    strings are rendered as text. Unknown placeholders are left as-is.
+    """
+    if not isinstance(variables, _TemplateVariables):
+        variables = _TemplateVariables(variables)
+    if isinstance(node, dict):
+        return {key: fill_template(value, variables) for key, value in node.items()}
+    if isinstance(node, list):
+        return [fill_template(value, variables) for value in node]
+    if isinstance(node, str) and "{{" in node:
+        match = TEMPLATE_RE.fullmatch(node)
+        if match and match.group(1) in variables:
+            return variables[match.group(1)]
+        return render_template(node, variables)
+    return node
+
+
+# Set after hashing, so excluded from the content hash (matches scripts/verify_asset.py)
+UNHASHED_FIELDS = ("contentHash", "signature")
+
+
+def seal_asset(
+    payload: Dict[str, Any],
+    hash_algo: str = "sha-256",
+    private_key_path: Optional[str] = None,
+    private_key=None
+) -> Dict[str, Any]:
+    """
+    Set contentHash and signature on a payload, in place
+    
+    The payload is canonicalized once, without UNHASHED_FIELDS (templates carry
+    placeholders for them), and the signature is over the resulting digest.
+    """
+    unsigned = {k: v for k, v in payload.items() if k not in UNHASHED_FIELDS}
+    content_hash = compute_content_hash(unsigned, hash_algo)
+    payload["contentHash"] = content_hash
+    payload["signature"] = sign_with_ed25519(bytes.fromhex(content_hash), private_key_path, private_key)
+    return payload
+
+
 def create_reputation_asset(
     creator_id: str,
     reputation_score: float,
@@ -86,39 +217,63 @@ def create_reputation_asset(
     sybil_penalty: float,
     alpha: float = 0.25,
     publisher_did: str = "did:key:publisher1",
-    private_key_path: Optional[str] = None
+    private_key_path: Optional[str] = None,
+    hash_algo: str = "sha-256",
+    private_key=None
 ) -> Dict[str, Any]:
-    """Create a ReputationAsset JSON-LD document"""
-    template = load_template("reputation_asset")
-    
-    timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    published_at = datetime.utcnow().isoformat() + "Z"
-    
-    # Replace template variables
-    asset = template.replace("{{creatorId}}", creator_id)
-    asset = asset.replace("{{timestamp}}", timestamp)
-    asset = asset.replace("{{publisherDid}}", publisher_did)
-    asset = asset.replace("{{publishedAt}}", published_at)
-    asset = asset.replace("{{reputationScore}}", str(reputation_score))
-    asset = asset.replace("{{graphScore}}", str(graph_score))
-    asset = asset.replace("{{stakeWeight}}", str(stake_weight))
-    asset = asset.replace("{{sybilPenalty}}", str(sybil_penalty))
-    asset = asset.replace("{{alpha}}", str(alpha))
-    asset = asset.replace("{{computedAt}}", published_at)
-    
-    # Parse as JSON
-    payload = json.loads(asset)
-    
-    # Compute content hash (before adding hash/signature)
-    content_hash = compute_content_hash(payload)
-    payload["contentHash"] = content_hash
+    """Create a ReputationAsset JSON-LD document (`private_key` overrides `private_key_path`)"""
+    template = load_template_parsed("reputation_asset")
     
-    # Sign the asset
-    payload_bytes = canonicalize_json(payload)
-    signature = sign_with_ed25519(payload_bytes, private_key_path)
-    payload["signature"] = signature
+    now = datetime.now(timezone.utc)
+    timestamp = now.strftime(UAL_TIMESTAMP_FORMAT)
+    published_at = utc_isoformat(now)
     
-    return payload
+    # Fill template variables (no re-serialization or re-parse)
+    payload = fill_template(template, {
+        "creatorId": creator_id,
+        "timestamp": timestamp,
+        "publisherDid": publisher_did,
+        "publishedAt": published_at,
+        "reputationScore": reputation_score,
+        "graphScore": graph_score,
+        "stakeWeight": stake_weight,
+        "sybilPenalty": sybil_penalty,
+        "alpha": alpha,
+        "computedAt": published_at
+    })
+    
+    # Non-default algorithms are declared in the asset (and covered by the hash)
+    if hash_algo != "sha-256":
+        payload["hashAlgo"] = hash_algo
+    
+    # Compute content hash and sign it
+    return seal_asset(payload, hash_algo, private_key_path, private_key)
+
+
+def _simulated_publish_result(payload: Dict[str, Any], error: Optional[str] = None) -> Dict[str, Any]:
+    """Build the simulated publish result used for --simulate and publish failures"""
+    ual = payload.get("id")
+    if ual is None:
+        # Derive the UAL from the content hash the asset already carries
+        content_hash = payload.get("contentHash") or compute_content_hash(payload)
+        ual = f"urn:ual:dotrep:simulated:{content_hash[:16]}"
+    result = {
+        "ual": ual,
+        "simulated": True,
+        "contentHash": payload.get("contentHash"),
+        "timestamp": utc_isoformat()
+    }
+    if error is not None:
+        result["error"] = error
+    return result
+
+
+def _publish_headers(api_key: Optional[str]) -> Dict[str, str]:
+    """Request headers for the Edge Node publish API"""
+    headers = {"Content-Type": "application/json"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    return headers
 
 
 def publish_to_edge_node(
@@ -130,23 +285,13 @@ def publish_to_edge_node(
     """Publish asset to DKG Edge Node or Mock"""
     if simulate:
         # Return simulated UAL
-        ual = payload.get("id", f"urn:ual:dotrep:simulated:{hashlib.sha256(json.dumps(payload).encode()).hexdigest()[:16]}")
-        return {
-            "ual": ual,
-            "simulated": True,
-            "contentHash": payload.get("contentHash"),
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
-    
-    headers = {"Content-Type": "application/json"}
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
+        return _simulated_publish_result(payload)
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{edge_url}/publish",
             json=payload,
-            headers=headers,
+            headers=_publish_headers(api_key),
             timeout=30
         )
         response.raise_for_status()
@@ -154,14 +299,127 @@ def publish_to_edge_node(
     except requests.exceptions.RequestException as e:
         print(f"Error publishing to edge node: {e}", file=sys.stderr)
         # Fallback to simulation
-        ual = payload.get("id", f"urn:ual:dotrep:simulated:{hashlib.sha256(json.dumps(payload).encode()).hexdigest()[:16]}")
-        return {
-            "ual": ual,
-            "simulated": True,
-            "error": str(e),
-            "contentHash": payload.get("contentHash"),
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
+        return _simulated_publish_result(payload, error=str(e))
+
+
+BUILD_LOG_PATH = Path(__file__).parent.parent.parent / "MANUS_BUILD_LOG.md"
+
+
+class BuildLogger:
+    """
+    Appends publish entries to MANUS_BUILD_LOG.md
+    
+    The log is opened once (with a 64 KiB buffer) for the lifetime of the
+    context, and each entry is a single write, so batch runs do not reopen
+    or flush the file per asset. Logging is skipped if the file is missing.
+    """
+    
+    def __init__(self, path: Path = BUILD_LOG_PATH):
+        self.path = path
+        self._file = None
+    
+    def __enter__(self) -> "BuildLogger":
+        if self.path.exists():
+            self._file = open(self.path, "a", buffering=64 * 1024)
+        else:
+            print(f"Warning: {self.path.name} not found, skipping log update", file=sys.stderr)
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def log(self, asset: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Record one published (or simulated) ReputationAsset"""
+        if self._file is None:
+            return
+        self._file.write(
+            f"\n## {utc_isoformat()}\n"
+            f"- **UAL**: {result.get('ual', 'N/A')}\n"
+            f"- **Type**: ReputationAsset\n"
+            f"- **Content Hash**: {asset.get('contentHash')}\n"
+            f"- **Simulated**: {result.get('simulated', False)}\n"
+        )
+
+
+async def publish_many(
+    payloads: List[Dict[str, Any]],
+    edge_url: str,
+    api_key: Optional[str] = None,
+    simulate: bool = False,
+    max_connections: int = 32,
+    build_log: Optional[BuildLogger] = None
+) -> List[Dict[str, Any]]:
+    """
+    Publish many assets concurrently to DKG Edge Node or Mock
+    
+    Keeps up to `max_connections` requests in flight, so wall time is roughly
+    ceil(N / max_connections) round-trips instead of N. Results are returned in
+    the same order as `payloads`, with the same fallback as publish_to_edge_node.
+    Each result is recorded in `build_log` if one is given.
+    """
+    if simulate:
+        results = [publish_to_edge_node(p, edge_url, api_key=api_key, simulate=True) for p in payloads]
+    elif not HTTPX_AVAILABLE:
+        # Fan out over the pooled requests session from a thread pool instead
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=max_connections) as pool:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(pool, partial(publish_to_edge_node, p, edge_url, api_key))
+                for p in payloads
+            ))
+    else:
+        headers = _publish_headers(api_key)
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        # Like SESSION, retry connection failures only, never a POST that was sent
+        transport = httpx.AsyncHTTPTransport(limits=limits, retries=PUBLISH_RETRIES)
+        
+        async with httpx.AsyncClient(transport=transport, timeout=30) as client:
+            async def _publish(payload: Dict[str, Any]) -> Dict[str, Any]:
+                try:
+                    response = await client.post(f"{edge_url}/publish", json=payload, headers=headers)
+                    response.raise_for_status()
+                    return response.json()
+                except httpx.HTTPError as e:
+                    print(f"Error publishing to edge node: {e}", file=sys.stderr)
+                    return _simulated_publish_result(payload, error=str(e))
+            
+            results = await asyncio.gather(*(_publish(p) for p in payloads))
+    
+    if build_log is not None:
+        for payload, result in zip(payloads, results):
+            build_log.log(payload, result)
+    return results
+
+
+def print_json(data: Any) -> None:
+    """Write indented JSON to stdout (encoded straight to the byte stream with orjson)"""
+    if ORJSON_AVAILABLE:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        sys.stdout.buffer.write(b"\n")
+    else:
+        print(json.dumps(data, indent=2))
+
+
+def read_batch_file(path: str) -> List[Dict[str, Any]]:
+    """Load asset parameters from a JSON Lines file (one create_reputation_asset kwargs object per line)"""
+    params = []
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                params.append(orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line))
+    return params
+
+
+def print_jsonl(rows: List[Dict[str, Any]]) -> None:
+    """Write one compact JSON document per line to stdout, in a single write"""
+    if ORJSON_AVAILABLE:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(b"".join(orjson.dumps(row) + b"\n" for row in rows))
+    else:
+        sys.stdout.write("".join(json.dumps(row) + "\n" for row in rows))
 
 
 def main():
@@ -178,9 +436,39 @@ def main():
     parser.add_argument("--simulate", action="store_true", help="Simulate publishing (don't call real Edge Node)")
     parser.add_argument("--private-key", type=str, help="Path to Ed25519 private key file")
     parser.add_argument("--publisher-did", type=str, default="did:key:publisher1", help="Publisher DID")
+    parser.add_argument("--hash-algo", choices=HASH_ALGOS, default="sha-256", help="Content hash algorithm")
+    parser.add_argument("--batch-file", type=str, help="JSON Lines file of asset parameters to publish in one run (fields default to the options above); results are written as JSON Lines")
     
     args = parser.parse_args()
     
+    if args.batch_file:
+        # Template, signing key and HTTP connections are set up once for the whole batch
+        defaults = {
+            "creator_id": args.creator_id,
+            "reputation_score": args.reputation_score,
+            "graph_score": args.graph_score,
+            "stake_weight": args.stake_weight,
+            "sybil_penalty": args.sybil_penalty,
+            "alpha": args.alpha,
+            "publisher_did": args.publisher_did,
+            "hash_algo": args.hash_algo
+        }
+        private_key = load_signing_key(args.private_key) if CRYPTO_AVAILABLE else None
+        assets = [
+            create_reputation_asset(**{**defaults, **params}, private_key=private_key)
+            for params in read_batch_file(args.batch_file)
+        ]
+        with BuildLogger() as build_log:
+            results = asyncio.run(publish_many(
+                assets,
+                edge_url=args.edge_url,
+                api_key=args.api_key,
+                simulate=args.simulate,
+                build_log=build_log
+            ))
+        print_jsonl(results)
+        return 0 if all(result.get("ual") for result in results) else 1
+    
     # Create reputation asset
     asset = create_reputation_asset(
         creator_id=args.creator_id,
@@ -190,7 +478,8 @@ def main():
         sybil_penalty=args.sybil_penalty,
         alpha=args.alpha,
         publisher_did=args.publisher_did,
-        private_key_path=args.private_key
+        private_key_path=args.private_key,
+        hash_algo=args.hash_algo
     )
     
     # Publish to edge node
@@ -202,19 +491,11 @@ def main():
     )
     
     # Output result
-    print(json.dumps(result, indent=2))
+    print_json(result)
     
     # Append to build log
-    build_log_path = Path(__file__).parent.parent.parent / "MANUS_BUILD_LOG.md"
-    if build_log_path.exists():
-        with open(build_log_path, "a") as f:
-            f.write(f"\n## {datetime.utcnow().isoformat()}Z\n")
-            f.write(f"- **UAL**: {result.get('ual', 'N/A')}\n")
-            f.write(f"- **Type**: ReputationAsset\n")
-            f.write(f"- **Content Hash**: {asset.get('contentHash')}\n")
-            f.write(f"- **Simulated**: {result.get('simulated', False)}\n")
-    else:
-        print(f"Warning: MANUS_BUILD_LOG.md not found, skipping log update", file=sys.stderr)
+    with BuildLogger() as build_log:
+        build_log.log(asset, result)
     
     return 0 if result.get("ual") else 1
 
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ReputationAsset creation
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory (and scripts/ for the verifier) to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "scripts"))
+
+from canonical_json import canonical_digest, canonicalize_json
+from publish_sample_asset import create_reputation_asset
+from verify_asset import verify_content_hash
+
+
+def test_verifier_reproduces_content_hash():
+    """The verifier must recompute the digest the publisher stored and signed"""
+    asset = create_reputation_asset(
+        creator_id="creator123",
+        reputation_score=0.873,
+        graph_score=0.78,
+        stake_weight=0.12,
+        sybil_penalty=0.05
+    )
+
+    assert "{{" not in asset["contentHash"] and "{{" not in asset["signature"]
+    hash_valid, message = verify_content_hash(asset)
+    assert hash_valid, message
+
+    # Any change to a hashed field must be detected
+    asset["reputationScore"] = 0.9
+    hash_valid, _ = verify_content_hash(asset)
+    assert not hash_valid
+
+
+# Floats, non-ASCII text and ints beyond 64 bits: where JSON encoders disagree
+_CANONICAL_DOC = {
+    "floats": [1e-7, 0.1, 1.5e300, -0.0, 123456789.123],
+    "text": "caf\u00e9 \u2713 \U0001f600 \"quoted\"\n",
+    "big": [2**63, 2**64, -2**70, 10**30],
+    "nested": {"b": [True, None], "a": {"\u00e9": 1}},
+    "padding": ["x" * 1000] * 100
+}
+
+
+def test_canonical_encoding_matches_baseline_encoder():
+    """Hashed bytes must equal the original sorted-keys json.dumps output"""
+    expected = json.dumps(_CANONICAL_DOC, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    assert canonicalize_json(_CANONICAL_DOC) == expected
+    # The streamed digest (over 64 KiB, so several blocks) hashes the same bytes
+    assert canonical_digest(_CANONICAL_DOC) == hashlib.sha256(expected).hexdigest()
+
+
+def test_canonical_encoding_matches_canonicaljson():
+    """Assets hashed with canonicaljson.encode_canonical_json must keep verifying"""
+    canonicaljson = pytest.importorskip("canonicaljson")
+    assert canonicalize_json(_CANONICAL_DOC) == canonicaljson.encode_canonical_json(_CANONICAL_DOC)
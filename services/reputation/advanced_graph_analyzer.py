@@ -5,12 +5,21 @@ Multi-dimensional reputation scoring with structural, behavioral, content qualit
 """
 
 import networkx as nx
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable, NamedTuple
 from datetime import datetime, timedelta
 import numpy as np
-from collections import defaultdict, Counter
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from scipy.sparse.csgraph import connected_components
+from functools import lru_cache
+from itertools import islice
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import hashlib
+import os
+import threading
 import time
+from pathlib import Path
 
 try:
     import community.community_louvain as community_louvain
@@ -19,51 +28,431 @@ except ImportError:
     LOUVAIN_AVAILABLE = False
     print("Warning: python-louvain not installed, using simplified community detection")
 
+# igraph's C implementations of Brandes betweenness and PageRank are orders of
+# magnitude faster than NetworkX's pure-Python ones
+try:
+    import igraph as ig
+    IGRAPH_AVAILABLE = True
+except ImportError:
+    IGRAPH_AVAILABLE = False
+
+# NetworKit's betweenness/closeness are multi-threaded C++; its closeness is
+# used whenever installed, its betweenness when it beats igraph's (more than one thread)
+try:
+    import networkit as nk
+    NETWORKIT_AVAILABLE = True
+except ImportError:
+    NETWORKIT_AVAILABLE = False
+
+# Numba compiles the per-node community-membership scan into a native loop
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _internal_count(u, indptr, indices, comm):
+        """Number of u's out-neighbours (CSR row u) that share u's community id"""
+        cu = comm[u]
+        count = 0
+        for k in range(indptr[u], indptr[u + 1]):
+            if comm[indices[k]] == cu:
+                count += 1
+        return count
+else:
+    def _internal_count(u, indptr, indices, comm):
+        """Number of u's out-neighbours (CSR row u) that share u's community id"""
+        return int(np.count_nonzero(comm[indices[indptr[u]:indptr[u + 1]]] == comm[u]))
+
+
+@lru_cache(maxsize=4096)
+def _map_confidence_to_quality(confidence: float, match_type: str) -> float:
+    """Pure Guardian confidence -> quality mapping, memoized across content items and users"""
+    if match_type == "exact" or match_type == "manipulated":
+        # High confidence match = low quality (harmful content)
+        return 1.0 - confidence
+    elif match_type == "near":
+        # Near match = medium quality concern
+        return 1.0 - (confidence * 0.5)
+    else:
+        # No match = high quality (clean content)
+        return confidence
+
+
+class NodeMetrics(NamedTuple):
+    """Per-node columns (structure of arrays); row i describes nodes[i]"""
+    nodes: List[Any]
+    index: Dict[Any, int]
+    in_deg: np.ndarray
+    out_deg: np.ndarray
+    deg: np.ndarray
+    stake: np.ndarray
+    stake_score: np.ndarray  # log-scaled stake, 0-10000 -> 0-1
+    account_age_days: np.ndarray
+    engagement: np.ndarray  # in/out degree balance
+    activity: np.ndarray  # min(1, deg / 100)
+    regularity: np.ndarray  # min(1, out_deg / 50)
+
 
 class AdvancedGraphAnalyzer:
     """Advanced graph analysis with multi-dimensional reputation scoring"""
     
-    def __init__(self, graph: nx.DiGraph, guardian_integrator=None):
+    # Exact Brandes betweenness is O(V·E); above this many nodes it is estimated
+    # from `betweenness_samples` source nodes instead (O(k·E), approximate scores).
+    # NetworKit's/igraph's exact native implementations stay affordable on larger graphs.
+    betweenness_sample_threshold = 100_000 if (NETWORKIT_AVAILABLE or IGRAPH_AVAILABLE) else 10_000
+    betweenness_samples = 500
+    
+    # Triadic closure slices the CSR submatrix from this many neighbors on; below
+    # it, per-neighbor set intersections beat SciPy's fancy-indexing overhead
+    triadic_sparse_threshold = 256
+    
+    # Structural/behavioral sub-scores in the order of their weights in the "combined" score
+    _STRUCT_KEYS = ("pagerank", "betweenness", "closeness", "degree", "eigenvector", "community_embeddedness")
+    _STRUCT_W = np.array([0.25, 0.2, 0.15, 0.15, 0.15, 0.1])
+    _BEHAV_KEYS = (
+        "engagement_consistency", "reciprocity_rate", "content_diversity", "connection_quality",
+        "response_patterns", "activity_longevity", "posting_regularity"
+    )
+    _BEHAV_W = np.array([0.20, 0.20, 0.15, 0.15, 0.15, 0.10, 0.05])
+    
+    # combine_scores dimensions, the "combined" value assumed when one is missing, and weights
+    _OVERALL_DIMENSIONS = ("structural", "behavioral", "content_quality", "economic", "temporal")
+    _OVERALL_DEFAULTS = (0.0, 0.0, 0.5, 0.0, 0.5)
+    _OVERALL_W = np.array([0.25, 0.20, 0.25, 0.20, 0.10])
+    
+    # Graph-wide results that are also persisted to disk (when a cache dir is set),
+    # keyed by a content hash of the graph so they survive process restarts
+    _PERSISTED_RESULTS = frozenset({"pagerank", "betweenness", "closeness", "eigenvector", "louvain"})
+    
+    def __init__(self, graph: nx.DiGraph, guardian_integrator=None, cache_dir: Optional[str] = None):
         """
         Initialize analyzer with graph and optional Guardian integrator
         
         Args:
             graph: NetworkX directed graph
             guardian_integrator: Optional GuardianIntegrator instance
+            cache_dir: Directory for the persistent graph-metric cache
+                (default: $REPUTATION_CACHE_DIR; unset disables it)
         """
         self.graph = graph
         self.guardian_integrator = guardian_integrator
+        cache_dir = cache_dir or os.getenv("REPUTATION_CACHE_DIR")
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
         self.sybil_detector = None  # Will be set externally
         self._cache = {}
         self._global_metrics_cache = None
         self._cache_timestamp = None
         self._cache_ttl = 3600  # Cache TTL in seconds (1 hour)
         self._batch_size = 500  # Default batch size for processing
-        self._global_metrics_cache = None
-        self._cache_timestamp = None
-        self._cache_ttl = 3600  # Cache TTL in seconds (1 hour)
-        self._batch_size = 500  # Default batch size for processing
+        # Graph-wide results (centralities, partitions, ...) by name -> (graph key, value, computed at)
+        self._graph_cache = {}
+        self._graph_cache_lock = threading.RLock()
+        # Bumped whenever the analyzer mutates the graph; callers that change
+        # self.graph directly should call invalidate_cache()
+        self._graph_version = 0
+        
+    def _graph_key(self) -> Tuple[int, int]:
+        """
+        Fingerprint of the current graph: node count plus the mutation version
         
+        Deliberately O(1): number_of_edges() walks every node, and this runs on
+        every per-user metric lookup.
+        """
+        return (self.graph.number_of_nodes(), self._graph_version)
+    
+    def _get_or_compute(self, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return the graph-wide result `name`, calling compute() only when it is
+        missing, was computed for a different graph version, or is older than
+        the cache TTL
+        """
+        key = self._graph_key()
+        now = time.time()
+        with self._graph_cache_lock:
+            cached = self._graph_cache.get(name)
+            if cached is not None and cached[0] == key and now - cached[2] < self._cache_ttl:
+                return cached[1]
+            persist = self.cache_dir is not None and name in self._PERSISTED_RESULTS
+            value = self._load_persisted(name) if persist else None
+            if value is None:
+                value = compute()
+                if persist:
+                    self._save_persisted(name, value)
+            self._graph_cache[name] = (key, value, now)
+            return value
+    
+    def invalidate_cache(self) -> None:
+        """
+        Mark every cached result stale after the graph changed outside
+        incremental_update (previous values are kept only as warm starts)
+        """
+        with self._graph_cache_lock:
+            self._graph_version += 1
+            self._global_metrics_cache = None
+            self._cache_timestamp = None
+            self._cache.clear()
+    
+    def _graph_hash(self) -> str:
+        """BLAKE2b digest of the node order and weighted edge list, streamed (cached per graph version)"""
+        def build():
+            h = hashlib.blake2b(digest_size=16)
+            for node in self.graph.nodes():
+                h.update(f"{node!r}\n".encode("utf-8"))
+            for u, v, w in self.graph.edges(data="weight", default=1.0):
+                h.update(f"{u!r}\t{v!r}\t{w!r}\n".encode("utf-8"))
+            return h.hexdigest()
+        return self._get_or_compute("graph_hash", build)
+    
+    def _persisted_path(self, name: str) -> Path:
+        return self.cache_dir / f"{self._graph_hash()}-{name}.npz"
+    
+    def _load_persisted(self, name: str) -> Any:
+        """Per-node result `name` for this exact graph from the disk cache, or None"""
+        path = self._persisted_path(name)
+        try:
+            with np.load(path) as data:
+                values = data["values"]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[cache] ignoring unreadable entry {path}: {e}")
+            return None
+        nodes = list(self.graph.nodes())
+        if len(values) != len(nodes):
+            return None
+        if name == "louvain":
+            return dict(zip(nodes, values.tolist())), values
+        return dict(zip(nodes, values.tolist()))
+    
+    def _save_persisted(self, name: str, value: Any) -> None:
+        """Store a per-node result as one array in node order (atomic rename)"""
+        if name == "louvain":
+            values = value[1]
+        else:
+            values = np.fromiter((value.get(node, 0.0) for node in self.graph.nodes()), dtype=np.float64)
+        path = self._persisted_path(name)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                np.savez(f, values=values)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[cache] could not write {path}: {e}")
+    
+    def _previous_result(self, name: str) -> Any:
+        """
+        Last value computed for `name`, possibly for an older graph version;
+        used to warm-start recomputation after incremental updates
+        """
+        with self._graph_cache_lock:
+            cached = self._graph_cache.get(name)
+        return cached[1] if cached is not None else None
+    
+    def _to_igraph(self) -> Tuple[Any, List[Any]]:
+        """igraph copy of the graph (vertex i is nodes[i]) with edge weights, cached per graph version"""
+        def build():
+            nodes = list(self.graph.nodes())
+            index = {node: i for i, node in enumerate(nodes)}
+            edges = [(index[u], index[v]) for u, v in self.graph.edges()]
+            ig_graph = ig.Graph(n=len(nodes), edges=edges, directed=True)
+            ig_graph.es["weight"] = [d.get("weight", 1.0) for _, _, d in self.graph.edges(data=True)]
+            return ig_graph, nodes
+        return self._get_or_compute("igraph", build)
+    
+    def _to_networkit(self, reverse: bool = False) -> Any:
+        """NetworKit copy of the graph (or of its reverse), node i = i-th node of self.graph, cached per graph version"""
+        if reverse:
+            return self._get_or_compute(
+                "networkit_reverse", lambda: nk.nxadapter.nx2nk(self.graph.reverse(copy=False))
+            )
+        return self._get_or_compute("networkit", lambda: nk.nxadapter.nx2nk(self.graph))
+    
+    def _ensure_csr(self) -> Tuple[sp.csr_array, List[Any], Dict[Any, int]]:
+        """Weighted CSR adjacency (row i = out-edges of nodes[i]) and node index, cached per graph version"""
+        def build():
+            nodes = list(self.graph.nodes())
+            A = nx.to_scipy_sparse_array(self.graph, nodelist=nodes, weight="weight", dtype=np.float64, format="csr")
+            return A, nodes, {node: i for i, node in enumerate(nodes)}
+        return self._get_or_compute("csr", build)
+    
+    def _undirected(self) -> nx.Graph:
+        """Undirected read-only view of the graph (no copy), cached per graph version"""
+        return self._get_or_compute("undirected", lambda: self.graph.to_undirected(as_view=True))
+    
+    def _node_id(self, user_did: Any) -> int:
+        """Row of `user_did` in the cached CSR / NodeMetrics arrays"""
+        return self._ensure_csr()[2][user_did]
+    
+    def _neighbors_idx(self, u: int) -> np.ndarray:
+        """Out-neighbours of node row `u` as CSR column indices (a view, no copy)"""
+        A = self._ensure_csr()[0]
+        return A.indices[A.indptr[u]:A.indptr[u + 1]]
+    
+    def _node_metrics(self) -> NodeMetrics:
+        """Degree/stake columns and the degree-derived scores of every node, cached per graph version"""
+        def build():
+            nodes = list(self.graph.nodes())
+            n = len(nodes)
+            in_deg = np.fromiter((d for _, d in self.graph.in_degree(nodes)), dtype=np.int64, count=n)
+            out_deg = np.fromiter((d for _, d in self.graph.out_degree(nodes)), dtype=np.int64, count=n)
+            deg = in_deg + out_deg
+            node_data = self.graph.nodes
+            stake = np.fromiter((node_data[node].get("stake", 0.0) for node in nodes), dtype=np.float64, count=n)
+            positive_stake = np.maximum(stake, 0.0)
+            stake_score = np.where(stake > 0, np.minimum(1.0, np.log(1 + positive_stake / 1000) / np.log(11)), 0.0)
+            account_age_days = np.fromiter(
+                (node_data[node].get("account_age_days", 0) for node in nodes), dtype=np.float64, count=n
+            )
+            engagement = 1.0 - np.abs(in_deg - out_deg) / np.maximum(deg, 1)
+            engagement[deg == 0] = 0.0
+            return NodeMetrics(
+                nodes=nodes,
+                index={node: i for i, node in enumerate(nodes)},
+                in_deg=in_deg,
+                out_deg=out_deg,
+                deg=deg,
+                stake=stake,
+                stake_score=stake_score,
+                account_age_days=account_age_days,
+                engagement=engagement,
+                activity=np.minimum(1.0, deg / 100.0),
+                regularity=np.minimum(1.0, out_deg / 50.0),
+            )
+        return self._get_or_compute("node_metrics", build)
+    
+    def _reciprocity_rates(self) -> np.ndarray:
+        """
+        Mutual / distinct (in or out) neighbour counts for every node, indexed like
+        the cached CSR; computed for all nodes at once from the pattern of A ∧ Aᵀ
+        """
+        def build():
+            A, _, _ = self._ensure_csr()
+            # Edge pattern only (zero-weight edges still count as connections)
+            P = sp.csr_array((np.ones(A.nnz), A.indices, A.indptr), shape=A.shape)
+            mutual = np.asarray(P.multiply(P.T).sum(axis=1)).ravel()
+            union = np.asarray(((P + P.T) > 0).sum(axis=1)).ravel()
+            return mutual / np.maximum(union, 1)
+        return self._get_or_compute("reciprocity", build)
+    
+    def _compute_pagerank(self, alpha: float = 0.85, max_iter: int = 200, tol: float = 1e-6) -> Dict[Any, float]:
+        """
+        Weighted PageRank for every node, via igraph when available
+        
+        Otherwise runs the power iteration as a sparse matrix-vector product on
+        the cached CSR adjacency (nx.pagerank semantics, absolute L1 tolerance).
+        After an incremental update the iteration starts from the previous
+        scores, which are already close to the new fixed point.
+        """
+        if IGRAPH_AVAILABLE:
+            ig_graph, nodes = self._to_igraph()
+            return dict(zip(nodes, ig_graph.pagerank(directed=True, damping=alpha, weights="weight")))
+        
+        A, nodes, _ = self._ensure_csr()
+        n = len(nodes)
+        if n == 0:
+            return {}
+        
+        # Column-stochastic transition matrix; dangling nodes spread their rank uniformly
+        out_weight = np.asarray(A.sum(axis=1)).ravel()
+        dangling = out_weight == 0
+        inv_out = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+        MT = (sp.diags_array(inv_out) @ A).T.tocsr()
+        
+        previous = self._previous_result("pagerank")
+        if previous:
+            rank = np.fromiter((previous.get(node, 1.0 / n) for node in nodes), dtype=np.float64, count=n)
+            rank /= rank.sum()
+        else:
+            rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            prev = rank
+            rank = alpha * (MT @ prev + prev[dangling].sum() / n) + (1 - alpha) / n
+            # Absolute L1 tolerance: nx.pagerank's N*tol stops almost at once on
+            # large sparse graphs and returns a nearly uniform vector
+            if np.abs(rank - prev).sum() < tol:
+                return dict(zip(nodes, rank.tolist()))
+        raise nx.PowerIterationFailedConvergence(max_iter)
+    
+    def _compute_betweenness(self) -> Dict[Any, float]:
+        """Normalized betweenness centrality for every node, via NetworKit or igraph when available"""
+        n = self.graph.number_of_nodes()
+        if n > self.betweenness_sample_threshold:
+            return nx.betweenness_centrality(self.graph, k=min(self.betweenness_samples, n), seed=42)
+        if NETWORKIT_AVAILABLE and (not IGRAPH_AVAILABLE or nk.getMaxNumberOfThreads() > 1):
+            # Unweighted, normalized by (n-1)(n-2) on directed graphs, like NetworkX
+            scores = nk.centrality.Betweenness(self._to_networkit(), normalized=True).run().scores()
+            return dict(zip(self.graph.nodes(), scores))
+        if IGRAPH_AVAILABLE:
+            ig_graph, nodes = self._to_igraph()
+            n = len(nodes)
+            # Same normalization as nx.betweenness_centrality on a directed graph
+            scale = 1.0 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+            return {node: b * scale for node, b in zip(nodes, ig_graph.betweenness(directed=True))}
+        return nx.betweenness_centrality(self.graph)
+    
+    def _compute_closeness(self) -> Dict[Any, float]:
+        """
+        Closeness centrality for every node, via NetworKit when available
+        
+        NetworkX scores directed graphs on incoming distances with the
+        Wasserman-Faust correction for unreachable nodes; NetworKit's
+        GENERALIZED variant on the reversed graph computes the same values.
+        """
+        if NETWORKIT_AVAILABLE:
+            closeness = nk.centrality.Closeness(
+                self._to_networkit(reverse=True), True, nk.centrality.ClosenessVariant.GENERALIZED
+            )
+            return dict(zip(self.graph.nodes(), closeness.run().scores()))
+        return nx.closeness_centrality(self.graph)
+    
+    def _compute_eigenvector(self) -> Dict[Any, float]:
+        """
+        Eigenvector centrality for every node, via ARPACK on the cached CSR
+        
+        Same definition as nx.eigenvector_centrality_numpy (unweighted,
+        in-edges, unit L2 norm) without rebuilding the adjacency; like NetworkX
+        it refuses graphs that are not strongly connected, whose leading
+        eigenvector is not unique.
+        """
+        A, nodes, _ = self._ensure_csr()
+        if not nodes:
+            raise nx.NetworkXPointlessConcept("cannot compute centrality for the null graph")
+        n_components, _ = connected_components(A, directed=True, connection="strong")
+        if n_components > 1:
+            raise nx.AmbiguousSolution("eigenvector centrality is not unique for disconnected graphs")
+        pattern = sp.csr_array((np.ones_like(A.data), A.indices, A.indptr), shape=A.shape)
+        _, vectors = spla.eigs(pattern.T, k=1, which="LR", tol=0)
+        largest = vectors[:, 0].real
+        largest /= np.sign(largest.sum()) * np.linalg.norm(largest)
+        return dict(zip(nodes, largest.tolist()))
+    
     def compute_comprehensive_reputation(
         self, 
         user_did: str,
-        stake_data: Optional[Dict[str, Any]] = None
+        stake_data: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Compute reputation using multiple graph algorithms
         
         Args:
             user_did: User identifier (DID or node ID)
+            timestamp: ISO timestamp to record (batch callers pass one for all users)
             
         Returns:
             Comprehensive analysis results with scores, risks, and recommendations
         """
         if user_did not in self.graph:
-            return self._empty_analysis(user_did)
+            return self._empty_analysis(user_did, timestamp)
         
         analysis_results = {
             "user": user_did,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "scores": {},
             "risks": {},
             "recommendations": []
@@ -112,7 +501,7 @@ class AdvancedGraphAnalyzer:
         # Apply Sybil risk penalty to overall reputation
         sybil_risk = analysis_results["risks"].get("overall_risk", 0.0)
         analysis_results["overall_reputation"] *= (1 - sybil_risk * 0.5)  # Up to 50% penalty
-        analysis_results["overall_reputation"] = max(0.0, min(1.0, analysis_results["overall_reputation"]))
+        analysis_results["overall_reputation"] = max(0.0, min(1.0, float(analysis_results["overall_reputation"])))
         
         # 8. Calculate confidence
         analysis_results["confidence"] = self.calculate_confidence(analysis_results["scores"])
@@ -125,6 +514,74 @@ class AdvancedGraphAnalyzer:
         
         return analysis_results
     
+    def compute_comprehensive_reputation_batch(
+        self,
+        user_dids: List[str],
+        stake_data_map: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_workers: int = 4
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute comprehensive reputation for many users
+        
+        Every graph-wide algorithm (centralities, Louvain) runs once up front;
+        each user's analysis then only looks up its own rows, so users are
+        scored concurrently (overlapping Guardian round-trips).
+        
+        Args:
+            user_dids: User identifiers (DIDs or node IDs)
+            stake_data_map: Optional mapping of user_did to stake data
+            max_workers: Maximum number of worker threads
+        
+        Returns:
+            Dictionary mapping user_did to its comprehensive analysis
+        """
+        self.precompute_global_metrics()
+        if LOUVAIN_AVAILABLE:
+            try:
+                self._get_community_partition()
+            except Exception as e:
+                print(f"Community detection error: {e}")
+        
+        stake_data_map = stake_data_map or {}
+        timestamp = datetime.now().isoformat()  # One timestamp for the whole batch
+        
+        def score(user_did):
+            return self.compute_comprehensive_reputation(user_did, stake_data_map.get(user_did), timestamp)
+        
+        # Submit at most _batch_size users at a time so huge batches do not
+        # queue a future per user up front
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i in range(0, len(user_dids), self._batch_size):
+                chunk = user_dids[i:i + self._batch_size]
+                results.update(zip(chunk, executor.map(score, chunk)))
+        return results
+    
+    def compute_batch_vectorized(self) -> Dict[str, np.ndarray]:
+        """
+        Per-node scores that depend only on graph structure and node metadata,
+        for every node at once as NumPy arrays (row i is nodes[i])
+        
+        Values equal what the per-user methods return for users without
+        explicit stake data.
+        
+        Returns:
+            Dictionary with "nodes" plus one array per score
+        """
+        metrics = self._node_metrics()
+        deg_score = np.minimum(1.0, metrics.deg / 50.0)
+        econ_age = np.minimum(1.0, metrics.account_age_days / 365.0)
+        temporal_age = np.minimum(1.0, metrics.account_age_days / 730.0)
+        return {
+            "nodes": metrics.nodes,
+            "engagement_consistency": metrics.engagement,
+            "reciprocity_rate": self._reciprocity_rates(),
+            "activity_longevity": metrics.activity,
+            "posting_regularity": metrics.regularity,
+            "economic": metrics.stake_score * 0.4 + metrics.activity * 0.3 + econ_age * 0.2,
+            "temporal": temporal_age * 0.4 + deg_score * 0.3 + metrics.activity * 0.3,
+        }
+    
     def structural_analysis(self, user_did: str, stake_weights: Optional[Dict[str, float]] = None, 
                             reputation_weights: Optional[Dict[str, float]] = None) -> Dict[str, float]:
         """Analyze user's position in social graph with trust-weighted PageRank"""
@@ -142,7 +599,7 @@ class AdvancedGraphAnalyzer:
                     reputation_weights=reputation_weights
                 )
             else:
-                pagerank = nx.pagerank(self.graph, max_iter=100, damping_factor=0.85)
+                pagerank = self._get_or_compute("pagerank", self._compute_pagerank)
             metrics["pagerank"] = pagerank.get(user_did, 0.0)
         except Exception as e:
             print(f"PageRank computation error: {e}")
@@ -150,7 +607,7 @@ class AdvancedGraphAnalyzer:
         
         # Betweenness Centrality - Brokerage power
         try:
-            betweenness = nx.betweenness_centrality(self.graph)
+            betweenness = self._get_or_compute("betweenness", self._compute_betweenness)
             metrics["betweenness"] = betweenness.get(user_did, 0.0)
         except Exception as e:
             print(f"Betweenness computation error: {e}")
@@ -158,7 +615,7 @@ class AdvancedGraphAnalyzer:
         
         # Closeness Centrality - Information flow efficiency
         try:
-            closeness = nx.closeness_centrality(self.graph)
+            closeness = self._get_or_compute("closeness", self._compute_closeness)
             metrics["closeness"] = closeness.get(user_did, 0.0)
         except Exception as e:
             print(f"Closeness computation error: {e}")
@@ -166,7 +623,7 @@ class AdvancedGraphAnalyzer:
         
         # Degree Centrality - Direct influence
         try:
-            degree = nx.degree_centrality(self.graph)
+            degree = self._get_or_compute("degree", lambda: nx.degree_centrality(self.graph))
             metrics["degree"] = degree.get(user_did, 0.0)
         except Exception as e:
             print(f"Degree computation error: {e}")
@@ -179,88 +636,119 @@ class AdvancedGraphAnalyzer:
     
     def analyze_community_embeddedness(self, user_did: str) -> float:
         """Analyze how well embedded user is in their community"""
-        if not LOUVAIN_AVAILABLE:
+        # Out-degree, the neighbourhood both estimates below are computed over
+        A, _, index = self._ensure_csr()
+        u = index[user_did]
+        degree = int(A.indptr[u + 1] - A.indptr[u])
+        if degree == 0:
+            return 0.0
+        
+        # Louvain is pointless on tiny graphs and for users with a couple of
+        # connections; the local triadic-closure estimate is O(deg²) there
+        if not LOUVAIN_AVAILABLE or degree < 3 or A.nnz < 20:
             # Simplified community analysis
-            neighbors = list(self.graph.neighbors(user_did))
-            if len(neighbors) < 2:
-                return 0.0
-            
-            # Count connections between neighbors (triadic closure)
-            neighbor_connections = 0
-            for n1 in neighbors:
-                for n2 in neighbors:
-                    if n1 != n2 and self.graph.has_edge(n1, n2):
-                        neighbor_connections += 1
-            
-            max_possible = len(neighbors) * (len(neighbors) - 1)
-            return neighbor_connections / max_possible if max_possible > 0 else 0.0
+            return self._triadic_closure(user_did)
         
         try:
-            # Use Louvain community detection
-            undirected = self.graph.to_undirected()
-            communities = community_louvain.best_partition(undirected)
-            user_community = communities.get(user_did)
-            
-            if user_community is None:
+            # Use Louvain community detection (partition computed once per graph version)
+            communities, community_ids = self._get_community_partition()
+            if user_did not in communities:
                 return 0.0
             
-            # Get all nodes in same community
-            community_nodes = [n for n, c in communities.items() if c == user_community]
-            
             # Calculate internal connection ratio
-            total_connections = len(list(self.graph.neighbors(user_did)))
-            if total_connections == 0:
-                return 0.0
-            
-            internal_connections = len([
-                n for n in self.graph.neighbors(user_did) 
-                if n in community_nodes
-            ])
-            
-            return internal_connections / total_connections if total_connections > 0 else 0.0
+            internal_connections = _internal_count(u, A.indptr, A.indices, community_ids)
+            return internal_connections / degree
             
         except Exception as e:
             print(f"Community detection error: {e}")
             return 0.0
     
+    def _get_community_partition(self) -> Tuple[Dict[Any, int], np.ndarray]:
+        """Louvain partition (node -> community) and CSR-aligned community ids, once per graph version"""
+        return self._get_or_compute("louvain", self._compute_louvain)
+    
+    def _compute_louvain(self) -> Tuple[Dict[Any, int], np.ndarray]:
+        """
+        Louvain partition of the undirected graph plus community ids indexed like the cached CSR
+        
+        After an incremental update, Louvain starts from the previous partition
+        (new nodes in singleton communities) instead of all singletons.
+        """
+        undirected = self._undirected()
+        initial = None
+        previous = self._previous_result("louvain")
+        if previous:
+            previous_partition = previous[0]
+            next_id = max(previous_partition.values(), default=-1) + 1
+            initial = {}
+            for node in undirected:
+                community = previous_partition.get(node)
+                if community is None:
+                    community, next_id = next_id, next_id + 1
+                initial[node] = community
+        partition = community_louvain.best_partition(undirected, partition=initial, random_state=42)
+        _, nodes, _ = self._ensure_csr()
+        community_ids = np.fromiter((partition.get(node, -1) for node in nodes), dtype=np.int64, count=len(nodes))
+        return partition, community_ids
+    
+    def _triadic_closure(self, user_did: str) -> float:
+        """Fraction of ordered neighbor pairs (n1 -> n2) that are themselves connected"""
+        adj = self.graph._adj
+        degree = len(adj[user_did])
+        if degree < 2:
+            return 0.0
+        
+        # Count connections between neighbors (triadic closure)
+        if degree >= self.triadic_sparse_threshold:
+            # Stored entries of the neighbors x neighbors CSR submatrix, minus self-loops
+            neighbors = self._neighbors_idx(self._node_id(user_did))
+            sub = self._ensure_csr()[0][neighbors][:, neighbors].tocoo()
+            neighbor_connections = int(np.count_nonzero(sub.row != sub.col))
+        else:
+            # One set intersection per neighbor instead of a has_edge call per pair
+            neighbors = set(adj[user_did])
+            neighbor_connections = sum(
+                len(adj[n1].keys() & neighbors) - (n1 in adj[n1])
+                for n1 in neighbors
+            )
+        
+        max_possible = degree * (degree - 1)
+        return neighbor_connections / max_possible
+    
     def normalize_structural_scores(self, metrics: Dict[str, float], user_did: Optional[str] = None) -> Dict[str, float]:
         """Normalize structural scores to [0, 1] range"""
-        normalized = {}
-        
-        # PageRank is already normalized
-        normalized["pagerank"] = min(1.0, max(0.0, metrics.get("pagerank", 0.0) * 100))
+        raw = {k: metrics.get(k, 0.0) for k in self._STRUCT_KEYS}
         
-        # Centrality measures are already normalized by networkx
-        normalized["betweenness"] = min(1.0, max(0.0, metrics.get("betweenness", 0.0)))
-        normalized["closeness"] = min(1.0, max(0.0, metrics.get("closeness", 0.0)))
-        normalized["degree"] = min(1.0, max(0.0, metrics.get("degree", 0.0)))
-        normalized["community_embeddedness"] = min(1.0, max(0.0, metrics.get("community_embeddedness", 0.0)))
+        # PageRank is already normalized (scaled up so typical scores span [0, 1])
+        raw["pagerank"] *= 100
         
         # Eigenvector Centrality (if not already computed)
-        if "eigenvector" not in metrics:
+        if "eigenvector" not in metrics and user_did:
             try:
-                if user_did and self.graph.number_of_nodes() < 10000:
-                    eigenvector = nx.eigenvector_centrality_numpy(self.graph)
-                    normalized["eigenvector"] = min(1.0, max(0.0, eigenvector.get(user_did, 0.0)))
-                else:
-                    normalized["eigenvector"] = 0.0
-            except:
-                normalized["eigenvector"] = 0.0
-        else:
-            normalized["eigenvector"] = min(1.0, max(0.0, metrics.get("eigenvector", 0.0)))
+                eigenvector = self._get_or_compute("eigenvector", self._compute_eigenvector)
+                raw["eigenvector"] = eigenvector.get(user_did, 0.0)
+            except Exception:
+                pass
+        
+        # Centrality measures are already normalized by networkx; clip everything in one pass
+        values = np.clip(np.fromiter(raw.values(), dtype=np.float64, count=len(raw)), 0.0, 1.0)
+        normalized = dict(zip(self._STRUCT_KEYS, values.tolist()))
         
         # Combined structural score (weighted average)
-        normalized["combined"] = (
-            normalized["pagerank"] * 0.25 +
-            normalized["betweenness"] * 0.2 +
-            normalized["closeness"] * 0.15 +
-            normalized["degree"] * 0.15 +
-            normalized["eigenvector"] * 0.15 +
-            normalized["community_embeddedness"] * 0.1
-        )
+        normalized["combined"] = float(values @ self._STRUCT_W)
         
         return normalized
     
+    def normalize_structural_scores_batch(self, metrics_matrix: np.ndarray) -> np.ndarray:
+        """
+        Combined structural score of many users at once
+        
+        Args:
+            metrics_matrix: One row per user, columns in _STRUCT_KEYS order
+                (pagerank already scaled as in normalize_structural_scores)
+        """
+        return np.clip(metrics_matrix, 0.0, 1.0) @ self._STRUCT_W
+    
     def behavioral_analysis(self, user_did: str) -> Dict[str, float]:
         """Analyze user behavior patterns"""
         behavior_metrics = {}
@@ -280,16 +768,15 @@ class AdvancedGraphAnalyzer:
     
     def analyze_connection_quality(self, user_did: str) -> float:
         """Analyze quality of user's connections"""
-        neighbors = list(self.graph.neighbors(user_did))
+        neighbors = self.graph._adj[user_did]
         if len(neighbors) == 0:
             return 0.0
         
         # Check average reputation/quality of neighbors
-        neighbor_qualities = []
-        for neighbor in neighbors[:20]:  # Sample for performance
-            # Use degree as proxy for quality (higher degree = more established)
-            neighbor_degree = self.graph.degree(neighbor)
-            neighbor_qualities.append(min(1.0, neighbor_degree / 50.0))
+        metrics = self._node_metrics()
+        sample = [metrics.index[neighbor] for neighbor in islice(neighbors, 20)]  # Sample for performance
+        # Use degree as proxy for quality (higher degree = more established)
+        neighbor_qualities = [min(1.0, degree / 50.0) for degree in metrics.deg[sample].tolist()]
         
         if neighbor_qualities:
             avg_quality = sum(neighbor_qualities) / len(neighbor_qualities)
@@ -299,92 +786,66 @@ class AdvancedGraphAnalyzer:
     
     def analyze_response_patterns(self, user_did: str) -> float:
         """Analyze response patterns and interaction timing"""
-        # Check for bidirectional connections (indicates active engagement)
-        out_neighbors = set(self.graph.successors(user_did))
-        in_neighbors = set(self.graph.predecessors(user_did))
-        
-        mutual = len(out_neighbors & in_neighbors)
-        total_unique = len(out_neighbors | in_neighbors)
-        
-        if total_unique == 0:
-            return 0.0
-        
-        # Higher mutual ratio = better response patterns
-        return mutual / total_unique
+        # Check for bidirectional connections (indicates active engagement):
+        # higher mutual ratio = better response patterns. Same ratio as
+        # reciprocity, precomputed for every node from the CSR pattern.
+        return float(self._reciprocity_rates()[self._node_id(user_did)])
     
     def analyze_engagement_patterns(self, user_did: str) -> float:
         """Analyze consistency of engagement patterns"""
-        # Simplified: check if user has balanced in/out degree
-        in_degree = self.graph.in_degree(user_did)
-        out_degree = self.graph.out_degree(user_did)
-        
-        total = in_degree + out_degree
-        if total == 0:
-            return 0.0
-        
-        # Balanced engagement is better
-        balance = 1.0 - abs(in_degree - out_degree) / total
-        return balance
+        # Simplified: check if user has balanced in/out degree (balanced engagement is better)
+        metrics = self._node_metrics()
+        return float(metrics.engagement[metrics.index[user_did]])
     
     def calculate_reciprocity(self, user_did: str) -> float:
         """Calculate reciprocity rate (mutual connections)"""
-        out_neighbors = set(self.graph.successors(user_did))
-        in_neighbors = set(self.graph.predecessors(user_did))
-        
-        # Mutual connections
-        mutual = len(out_neighbors & in_neighbors)
-        total_unique = len(out_neighbors | in_neighbors)
-        
-        return mutual / total_unique if total_unique > 0 else 0.0
+        return float(self._reciprocity_rates()[self._node_id(user_did)])
     
     def analyze_content_diversity(self, user_did: str) -> float:
         """Analyze diversity of connections (simplified)"""
-        neighbors = list(self.graph.neighbors(user_did))
+        neighbors = self._neighbors_idx(self._node_id(user_did))
         if len(neighbors) < 2:
             return 0.0
         
-        # Check if neighbors are well-connected to diverse parts of graph
-        neighbor_communities = set()
-        for neighbor in neighbors[:10]:  # Sample for performance
-            neighbor_neighbors = list(self.graph.neighbors(neighbor))
-            neighbor_communities.add(len(neighbor_neighbors))
+        # Check if neighbors are well-connected to diverse parts of graph:
+        # distinct out-degrees across all neighbors (not just a leading sample)
+        distinct_degrees = np.unique(self._node_metrics().out_deg[neighbors]).size
         
         # Higher diversity = better
-        diversity = len(neighbor_communities) / max(len(neighbors), 1)
+        diversity = distinct_degrees / len(neighbors)
         return min(1.0, diversity)
     
     def analyze_account_age_activity(self, user_did: str) -> float:
         """Analyze account age and activity (simplified - assumes all nodes are active)"""
         # In real implementation, would check node metadata for creation date
-        # For now, use degree as proxy for activity
-        degree = self.graph.degree(user_did)
-        # Normalize: assume max degree of 100 is full activity
-        return min(1.0, degree / 100.0)
+        # For now, use degree as proxy for activity (max degree of 100 is full activity)
+        metrics = self._node_metrics()
+        return float(metrics.activity[metrics.index[user_did]])
     
     def analyze_posting_regularity(self, user_did: str) -> float:
         """Analyze posting regularity (simplified)"""
         # In real implementation, would analyze temporal patterns
         # For now, use out-degree as proxy
-        out_degree = self.graph.out_degree(user_did)
-        return min(1.0, out_degree / 50.0)
+        metrics = self._node_metrics()
+        return float(metrics.regularity[metrics.index[user_did]])
     
     def normalize_behavioral_scores(self, metrics: Dict[str, float]) -> Dict[str, float]:
         """Normalize behavioral scores"""
-        normalized = {k: min(1.0, max(0.0, v)) for k, v in metrics.items()}
+        values = np.clip(np.fromiter(metrics.values(), dtype=np.float64, count=len(metrics)), 0.0, 1.0)
+        normalized = dict(zip(metrics, values.tolist()))
         
         # Combined behavioral score (updated weights)
-        normalized["combined"] = (
-            normalized.get("engagement_consistency", 0.0) * 0.20 +
-            normalized.get("reciprocity_rate", 0.0) * 0.20 +
-            normalized.get("content_diversity", 0.0) * 0.15 +
-            normalized.get("connection_quality", 0.0) * 0.15 +
-            normalized.get("response_patterns", 0.0) * 0.15 +
-            normalized.get("activity_longevity", 0.0) * 0.10 +
-            normalized.get("posting_regularity", 0.0) * 0.05
+        weighted = np.fromiter(
+            (normalized.get(k, 0.0) for k in self._BEHAV_KEYS), dtype=np.float64, count=len(self._BEHAV_KEYS)
         )
+        normalized["combined"] = float(weighted @ self._BEHAV_W)
         
         return normalized
     
+    def normalize_behavioral_scores_batch(self, metrics_matrix: np.ndarray) -> np.ndarray:
+        """Combined behavioral score of many users at once (rows = users, columns in _BEHAV_KEYS order)"""
+        return np.clip(metrics_matrix, 0.0, 1.0) @ self._BEHAV_W
+    
     def content_quality_analysis(self, user_did: str) -> Dict[str, float]:
         """Integrate Umanitek Guardian for content verification"""
         if not self.guardian_integrator:
@@ -397,40 +858,77 @@ class AdvancedGraphAnalyzer:
             if not user_content:
                 return {"combined": 0.5, "verified_content_ratio": 0.5}
             
-            guardian_scores = []
-            verified_count = 0
-            
-            for content_item in user_content:
-                # Submit to Umanitek Guardian for verification
-                verification_result = self.guardian_integrator.verify_content(
+            # Submit each item to Umanitek Guardian for verification
+            verification_results = [
+                self.guardian_integrator.verify_content(
                     content_item.get("fingerprint", ""),
                     content_item.get("content_type", "text")
                 )
+                for content_item in user_content
+            ]
+            return self._summarize_verifications(verification_results)
                 
-                if verification_result.get("status") == "verified":
-                    # Convert Guardian confidence to quality score
-                    quality_score = self.map_guardian_confidence_to_quality(
-                        verification_result.get("confidence", 0.5),
-                        verification_result.get("match_type", "none")
-                    )
-                    guardian_scores.append(quality_score)
-                    verified_count += 1
+        except Exception as e:
+            print(f"Guardian integration error: {e}")
+            return {"combined": 0.5, "verified_content_ratio": 0.5}
+    
+    async def content_quality_analysis_async(self, user_did: str) -> Dict[str, float]:
+        """
+        content_quality_analysis with the Guardian calls issued concurrently
+        
+        Uses the integrator's verify_content_async when it has one; otherwise the
+        blocking verify_content calls run on the default executor.
+        """
+        if not self.guardian_integrator:
+            return {"combined": 0.5, "verified_content_ratio": 0.5}
+        
+        try:
+            user_content = self.query_user_content(user_did, limit=50)
             
-            if guardian_scores:
-                avg_score = sum(guardian_scores) / len(guardian_scores)
-                verified_ratio = verified_count / len(user_content)
-                return {
-                    "combined": avg_score,
-                    "verified_content_ratio": verified_ratio,
-                    "average_confidence": avg_score
-                }
-            else:
-                return {"combined": 0.5, "verified_content_ratio": 0.0}
+            if not user_content:
+                return {"combined": 0.5, "verified_content_ratio": 0.5}
+            
+            verify_async = getattr(self.guardian_integrator, "verify_content_async", None)
+            if verify_async is None:
+                verify = self.guardian_integrator.verify_content
+                verify_async = lambda *args: asyncio.to_thread(verify, *args)
+            
+            verification_results = await asyncio.gather(*(
+                verify_async(
+                    content_item.get("fingerprint", ""),
+                    content_item.get("content_type", "text")
+                )
+                for content_item in user_content
+            ))
+            return self._summarize_verifications(verification_results)
                 
         except Exception as e:
             print(f"Guardian integration error: {e}")
             return {"combined": 0.5, "verified_content_ratio": 0.5}
     
+    def _summarize_verifications(self, verification_results: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Average quality of the verified items among one user's Guardian results"""
+        guardian_scores = [
+            # Convert Guardian confidence to quality score
+            self.map_guardian_confidence_to_quality(
+                verification_result.get("confidence", 0.5),
+                verification_result.get("match_type", "none")
+            )
+            for verification_result in verification_results
+            if verification_result.get("status") == "verified"
+        ]
+        
+        if guardian_scores:
+            avg_score = sum(guardian_scores) / len(guardian_scores)
+            verified_ratio = len(guardian_scores) / len(verification_results)
+            return {
+                "combined": avg_score,
+                "verified_content_ratio": verified_ratio,
+                "average_confidence": avg_score
+            }
+        else:
+            return {"combined": 0.5, "verified_content_ratio": 0.0}
+    
     def query_user_content(self, user_did: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Query user content from graph metadata or DKG"""
         # Simplified: return empty list
@@ -439,15 +937,7 @@ class AdvancedGraphAnalyzer:
     
     def map_guardian_confidence_to_quality(self, confidence: float, match_type: str) -> float:
         """Map Guardian verification confidence to quality score"""
-        if match_type == "exact" or match_type == "manipulated":
-            # High confidence match = low quality (harmful content)
-            return 1.0 - confidence
-        elif match_type == "near":
-            # Near match = medium quality concern
-            return 1.0 - (confidence * 0.5)
-        else:
-            # No match = high quality (clean content)
-            return confidence
+        return _map_confidence_to_quality(confidence, match_type)
     
     def economic_analysis(
         self, 
@@ -461,30 +951,32 @@ class AdvancedGraphAnalyzer:
             user_did: User identifier
             stake_data: Optional dict with stake_amount, transaction_diversity, etc.
         """
-        node_data = self.graph.nodes.get(user_did, {})
+        metrics = self._node_metrics()
+        i = metrics.index.get(user_did)
         
         # Get stake amount from stake_data or node metadata
         if stake_data:
             stake_amount = stake_data.get("stake_amount", 0.0)
             transaction_diversity = stake_data.get("transaction_diversity", 0.0)
+            
+            # Normalize stake (log scale for diminishing returns)
+            if stake_amount > 0:
+                stake_score = min(1.0, float(np.log(1 + stake_amount / 1000) / np.log(11)))  # Maps 0-10000 to 0-1
+            else:
+                stake_score = 0.0
         else:
-            stake_amount = node_data.get("stake", 0.0)
+            # Same log-scaled score, precomputed for every node's own stake
+            stake_score = float(metrics.stake_score[i]) if i is not None else 0.0
             transaction_diversity = 0.0
         
-        # Normalize stake (log scale for diminishing returns)
-        if stake_amount > 0:
-            stake_score = min(1.0, np.log(1 + stake_amount / 1000) / np.log(11))  # Maps 0-10000 to 0-1
-        else:
-            stake_score = 0.0
-        
         # Transaction activity (use degree as proxy if no explicit data)
         if transaction_diversity > 0:
             transaction_activity = min(1.0, transaction_diversity)
         else:
-            transaction_activity = min(1.0, self.graph.degree(user_did) / 100.0)
+            transaction_activity = float(metrics.activity[i]) if i is not None else 0.0
         
         # Account age factor (if available in node data)
-        account_age_days = node_data.get("account_age_days", 0)
+        account_age_days = float(metrics.account_age_days[i]) if i is not None else 0.0
         age_score = min(1.0, account_age_days / 365.0)  # Normalize to 1 year
         
         return {
@@ -511,38 +1003,36 @@ class AdvancedGraphAnalyzer:
         - Economic: 20% (staking & transactions)
         - Temporal: 10% (long-term patterns)
         """
-        structural = scores.get("structural", {}).get("combined", 0.0)
-        behavioral = scores.get("behavioral", {}).get("combined", 0.0)
-        content_quality = scores.get("content_quality", {}).get("combined", 0.5)
-        economic = scores.get("economic", {}).get("combined", 0.0)
-        temporal = scores.get("temporal", {}).get("combined", 0.5)  # Default neutral
+        combined = np.fromiter(
+            (scores.get(dim, {}).get("combined", default)
+             for dim, default in zip(self._OVERALL_DIMENSIONS, self._OVERALL_DEFAULTS)),
+            dtype=np.float64,
+            count=len(self._OVERALL_DIMENSIONS)
+        )
         
         # Weighted combination (matching guide specifications)
-        overall = (
-            structural * 0.25 +
-            behavioral * 0.20 +
-            content_quality * 0.25 +
-            economic * 0.20 +
-            temporal * 0.10
-        )
+        overall = float(combined @ self._OVERALL_W)
         
         return min(1.0, max(0.0, overall))
     
+    def combine_scores_batch(self, combined_matrix: np.ndarray) -> np.ndarray:
+        """Overall reputation of many users at once (rows = users, "combined" scores in _OVERALL_DIMENSIONS order)"""
+        return np.clip(combined_matrix @ self._OVERALL_W, 0.0, 1.0)
+    
     def temporal_analysis(self, user_did: str) -> Dict[str, float]:
         """Analyze long-term temporal patterns"""
-        node_data = self.graph.nodes.get(user_did, {})
+        metrics = self._node_metrics()
+        i = metrics.index[user_did]
         
         # Account age (if available)
-        account_age_days = node_data.get("account_age_days", 0)
-        age_score = min(1.0, account_age_days / 730.0)  # Normalize to 2 years
+        age_score = min(1.0, float(metrics.account_age_days[i]) / 730.0)  # Normalize to 2 years
         
         # Activity consistency over time (simplified - use degree as proxy)
-        degree = self.graph.degree(user_did)
-        consistency_score = min(1.0, degree / 50.0)
+        consistency_score = min(1.0, float(metrics.deg[i]) / 50.0)
         
         # Long-term engagement (check for sustained activity)
         # In real implementation, would analyze activity over time windows
-        engagement_score = min(1.0, (self.graph.in_degree(user_did) + self.graph.out_degree(user_did)) / 100.0)
+        engagement_score = float(metrics.activity[i])
         
         return {
             "account_age_score": age_score,
@@ -620,11 +1110,11 @@ class AdvancedGraphAnalyzer:
         
         return recommendations
     
-    def _empty_analysis(self, user_did: str) -> Dict[str, Any]:
+    def _empty_analysis(self, user_did: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Return empty analysis for non-existent users"""
         return {
             "user": user_did,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "scores": {
                 "structural": self._empty_structural_scores(),
                 "behavioral": {},
@@ -660,85 +1150,61 @@ class AdvancedGraphAnalyzer:
         Returns:
             Dict mapping node -> trust-weighted PageRank score
         """
-        nodes = list(self.graph.nodes())
+        A, nodes, index = self._ensure_csr()
         N = len(nodes)
         if N == 0:
             return {}
         
-        initial_score = 1.0 / N
-        scores = {node: initial_score for node in nodes}
+        # Edge weights, out-degrees and trust weights do not change between
+        # iterations, so fold them into one per-edge factor, computed for all
+        # edges at once
+        edges = A.tocoo()
+        src_idx, dst_idx, edge_weight = edges.row, edges.col, edges.data
+        base_weight = edge_weight / self._node_metrics().out_deg[src_idx]
+        
+        # Per-source trust: economic stake (up to 50% boost) and reputation (30% boost)
+        source_trust = np.ones(N)
+        if stake_weights:
+            rows, stakes = self._node_values(stake_weights)
+            source_trust[rows] *= 1.0 + np.minimum(1.0, stakes / 10000) * 0.5
+        if reputation_weights:
+            rows, reputations = self._node_values(reputation_weights)
+            source_trust[rows] *= 1.0 + reputations * 0.3
+        
+        # Connection strength: 1.5 for mutual connections, else the edge weight capped at 1
+        edge_keys = src_idx.astype(np.int64) * N + dst_idx
+        mutual = np.isin(dst_idx.astype(np.int64) * N + src_idx, edge_keys)
+        connection_strength = np.where(mutual, 1.5, np.minimum(1.0, edge_weight))
+        
+        trust_weight = np.minimum(source_trust[src_idx] * connection_strength, 2.0)  # Cap maximum weight
+        
+        # Row = target, column = source: one CSR SpMV gathers every node's incoming votes
+        votes = sp.csr_array((base_weight * trust_weight, (dst_idx, src_idx)), shape=(N, N))
+        
+        teleport = (1 - damping_factor) / N
+        scores = np.full(N, 1.0 / N)
         
         for iteration in range(max_iterations):
-            new_scores = {}
-            total_change = 0
-            
-            for node in nodes:
-                # Sum of weighted votes from incoming links
-                rank_sum = 0.0
-                in_edges = self.graph.in_edges(node, data=True)
-                
-                for source, target, edge_data in in_edges:
-                    source_degree = self.graph.out_degree(source)
-                    if source_degree > 0:
-                        base_weight = edge_data.get('weight', 1.0) / source_degree
-                        
-                        # Apply trust weights
-                        trust_weight = self._calculate_trust_weight(
-                            source, target, stake_weights, reputation_weights
-                        )
-                        weighted_contribution = scores[source] * base_weight * trust_weight
-                        rank_sum += weighted_contribution
-                
-                # PageRank formula with damping
-                new_score = (1 - damping_factor) / N + damping_factor * rank_sum
-                new_scores[node] = new_score
-                total_change += abs(new_score - scores[node])
+            # Sum of weighted votes from incoming links for every node at once
+            rank_sum = votes @ scores
             
+            # PageRank formula with damping
+            new_scores = teleport + damping_factor * rank_sum
+            total_change = np.abs(new_scores - scores).sum()
             scores = new_scores
             
             # Convergence check
             if total_change < 1e-6:
                 break
         
-        return self._normalize_pagerank_scores(scores)
+        return self._normalize_pagerank_scores(dict(zip(nodes, scores.tolist())))
     
-    def _calculate_trust_weight(
-        self,
-        source: str,
-        target: str,
-        stake_weights: Optional[Dict[str, float]],
-        reputation_weights: Optional[Dict[str, float]]
-    ) -> float:
-        """Calculate trust weight for edge weighting"""
-        weight = 1.0  # Base weight
-        
-        # Economic stake weighting
-        if stake_weights and source in stake_weights:
-            stake_weight = min(1.0, stake_weights[source] / 10000)  # Normalize
-            weight *= (1.0 + stake_weight * 0.5)  # 50% boost for high stake
-        
-        # Reputation-based weighting  
-        if reputation_weights and source in reputation_weights:
-            rep_weight = reputation_weights[source]
-            weight *= (1.0 + rep_weight * 0.3)  # 30% boost for high reputation
-        
-        # Connection strength adjustment
-        connection_strength = self._calculate_connection_strength(source, target)
-        weight *= connection_strength
-        
-        return min(weight, 2.0)  # Cap maximum weight
-    
-    def _calculate_connection_strength(self, source: str, target: str) -> float:
-        """Calculate connection strength between two nodes"""
-        # Check for mutual connections (stronger if bidirectional)
-        if self.graph.has_edge(target, source):
-            return 1.5  # 50% boost for mutual connection
-        
-        # Check edge weight if available
-        edge_data = self.graph.get_edge_data(source, target, {})
-        edge_weight = edge_data.get('weight', 1.0)
-        
-        return min(1.0, edge_weight)
+    def _node_values(self, values: Dict[Any, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR rows and values of the entries of `values` whose node is in the graph"""
+        index = self._ensure_csr()[2]
+        known = [(index[node], value) for node, value in values.items() if node in index]
+        rows = np.fromiter((i for i, _ in known), dtype=np.int64, count=len(known))
+        return rows, np.fromiter((v for _, v in known), dtype=np.float64, count=len(known))
     
     def _normalize_pagerank_scores(self, scores: Dict[str, float]) -> Dict[str, float]:
         """Normalize PageRank scores to [0, 1] range"""
@@ -785,38 +1251,35 @@ class AdvancedGraphAnalyzer:
         
         try:
             # Pre-compute PageRank for all nodes
-            metrics["pagerank"] = nx.pagerank(self.graph, max_iter=100, damping_factor=0.85)
+            metrics["pagerank"] = self._get_or_compute("pagerank", self._compute_pagerank)
         except Exception as e:
             print(f"PageRank pre-computation error: {e}")
             metrics["pagerank"] = {}
         
         try:
             # Pre-compute betweenness centrality
-            metrics["betweenness"] = nx.betweenness_centrality(self.graph)
+            metrics["betweenness"] = self._get_or_compute("betweenness", self._compute_betweenness)
         except Exception as e:
             print(f"Betweenness pre-computation error: {e}")
             metrics["betweenness"] = {}
         
         try:
             # Pre-compute closeness centrality
-            metrics["closeness"] = nx.closeness_centrality(self.graph)
+            metrics["closeness"] = self._get_or_compute("closeness", self._compute_closeness)
         except Exception as e:
             print(f"Closeness pre-computation error: {e}")
             metrics["closeness"] = {}
         
         try:
             # Pre-compute degree centrality
-            metrics["degree"] = nx.degree_centrality(self.graph)
+            metrics["degree"] = self._get_or_compute("degree", lambda: nx.degree_centrality(self.graph))
         except Exception as e:
             print(f"Degree pre-computation error: {e}")
             metrics["degree"] = {}
         
         try:
-            # Pre-compute eigenvector centrality (if graph is not too large)
-            if self.graph.number_of_nodes() < 10000:
-                metrics["eigenvector"] = nx.eigenvector_centrality_numpy(self.graph)
-            else:
-                metrics["eigenvector"] = {}
+            # Pre-compute eigenvector centrality
+            metrics["eigenvector"] = self._get_or_compute("eigenvector", self._compute_eigenvector)
         except Exception as e:
             print(f"Eigenvector pre-computation error: {e}")
             metrics["eigenvector"] = {}
@@ -848,6 +1311,7 @@ class AdvancedGraphAnalyzer:
             Dictionary mapping user_did to reputation results
         """
         results = {}
+        timestamp = datetime.now().isoformat()  # One timestamp for the whole batch
         
         # Pre-compute global graph metrics
         if use_cache:
@@ -867,7 +1331,8 @@ class AdvancedGraphAnalyzer:
                         self._compute_single_reputation_with_cache,
                         user,
                         global_metrics,
-                        stake_data_map.get(user) if stake_data_map else None
+                        stake_data_map.get(user) if stake_data_map else None,
+                        timestamp
                     ): user
                     for user in batch
                 }
@@ -878,7 +1343,7 @@ class AdvancedGraphAnalyzer:
                         results[user] = future.result()
                     except Exception as e:
                         print(f"Error computing reputation for {user}: {e}")
-                        results[user] = self._empty_analysis(user)
+                        results[user] = self._empty_analysis(user, timestamp)
         
         return results
     
@@ -886,11 +1351,12 @@ class AdvancedGraphAnalyzer:
         self,
         user_did: str,
         global_metrics: Optional[Dict[str, Any]],
-        stake_data: Optional[Dict[str, Any]]
+        stake_data: Optional[Dict[str, Any]],
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """Compute reputation for a single user using cached global metrics"""
         if user_did not in self.graph:
-            return self._empty_analysis(user_did)
+            return self._empty_analysis(user_did, timestamp)
         
         # Use cached metrics if available
         if global_metrics:
@@ -934,7 +1400,7 @@ class AdvancedGraphAnalyzer:
         # Apply Sybil penalty
         sybil_risk = risks.get("overall_risk", 0.0)
         overall_reputation *= (1 - sybil_risk * 0.5)
-        overall_reputation = max(0.0, min(1.0, overall_reputation))
+        overall_reputation = max(0.0, min(1.0, float(overall_reputation)))
         
         # Generate recommendations
         analysis = {
@@ -946,7 +1412,7 @@ class AdvancedGraphAnalyzer:
         
         return {
             "user": user_did,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "scores": scores,
             "risks": risks,
             "overall_reputation": overall_reputation,
@@ -998,8 +1464,10 @@ class AdvancedGraphAnalyzer:
                 del self._cache[user]
         
         # Invalidate global metrics cache (graph structure changed)
-        self._global_metrics_cache = None
-        self._cache_timestamp = None
+        with self._graph_cache_lock:
+            self._graph_version += 1
+            self._global_metrics_cache = None
+            self._cache_timestamp = None
         
         # Recompute only affected users
         print(f"Incremental update: recomputing {len(affected_users)} affected users")
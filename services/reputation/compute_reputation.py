@@ -6,12 +6,15 @@ Computes weighted PageRank with Sybil heuristics and publishes ReputationAsset J
 
 import json
 import argparse
+import asyncio
 import sys
 import os
+import time
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime
 import numpy as np
+import scipy.sparse as sp
 
 # Try to import networkx
 try:
@@ -21,6 +24,13 @@ except ImportError:
     NETWORKX_AVAILABLE = False
     print("Warning: networkx not installed, using simplified graph computation")
 
+# Prefer orjson for writing result files (several times faster than json.dump)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Import advanced components
 try:
     from advanced_graph_analyzer import AdvancedGraphAnalyzer
@@ -47,7 +57,7 @@ for path in ingest_paths:
     if path.exists():
         sys.path.insert(0, str(path))
         try:
-            from publish_sample_asset import create_reputation_asset, publish_to_edge_node
+            from publish_sample_asset import create_reputation_asset, publish_many
             publisher_available = True
             break
         except ImportError:
@@ -58,7 +68,7 @@ if not publisher_available:
     # Define stub functions
     def create_reputation_asset(*args, **kwargs):
         raise NotImplementedError("Publisher not available")
-    def publish_to_edge_node(*args, **kwargs):
+    async def publish_many(*args, **kwargs):
         raise NotImplementedError("Publisher not available")
 
 
@@ -68,6 +78,84 @@ def load_graph(input_path: str) -> Dict[str, Any]:
         return json.load(f)
 
 
+def write_results(results: Dict[str, Any], output_path: str, default=None):
+    """Write results as indented JSON, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(
+            results,
+            default=default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+        with open(output_path, 'wb') as f:
+            f.write(data)
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(results, f, indent=2, default=default)
+
+
+def build_transition_matrix(
+    nodes: List[str],
+    edges: List[Tuple[str, str, float]]
+) -> Tuple[sp.csr_matrix, np.ndarray, List[str]]:
+    """
+    Build the column-stochastic PageRank transition matrix once as CSR
+    
+    Entry (j, i) holds weight(i -> j) / out_weight(i); parallel edges are summed.
+    Edge endpoints missing from `nodes` are appended, matching networkx.
+    
+    Returns:
+        (M, dangling mask, node list in matrix order)
+    """
+    node_list = list(nodes)
+    index = {node: i for i, node in enumerate(node_list)}
+    for source, target, _ in edges:
+        for node in (source, target):
+            if node not in index:
+                index[node] = len(node_list)
+                node_list.append(node)
+    
+    n = len(node_list)
+    src = np.fromiter((index[e[0]] for e in edges), dtype=np.int64, count=len(edges))
+    dst = np.fromiter((index[e[1]] for e in edges), dtype=np.int64, count=len(edges))
+    weights = np.fromiter((e[2] for e in edges), dtype=np.float64, count=len(edges))
+    
+    W = sp.csr_matrix((weights, (dst, src)), shape=(n, n))
+    out_weight = np.asarray(W.sum(axis=0)).ravel()
+    dangling = out_weight == 0
+    S = np.zeros(n)
+    S[~dangling] = 1.0 / out_weight[~dangling]
+    M = (W @ sp.spdiags(S, 0, n, n)).tocsr()
+    return M, dangling, node_list
+
+
+def sparse_pagerank(
+    M: sp.csr_matrix,
+    dangling: np.ndarray,
+    alpha: float = 0.85,
+    max_iter: int = 100,
+    tol: float = 1e-6
+) -> np.ndarray:
+    """
+    Power iteration pr = (1-alpha)/n + alpha * (M @ pr + dangling mass / n)
+    
+    Raises like nx.pagerank when the L1 change is still >= tol after
+    max_iter iterations, so an unconverged vector is never published.
+    """
+    n = M.shape[0]
+    pr = np.full(n, 1.0 / n)
+    teleport = (1 - alpha) / n
+    diff = np.inf
+    for _ in range(max_iter):
+        pr_new = alpha * (M @ pr + pr[dangling].sum() / n) + teleport
+        diff = np.abs(pr_new - pr).sum()
+        pr = pr_new
+        if diff < tol:
+            return pr
+    if NETWORKX_AVAILABLE:
+        raise nx.PowerIterationFailedConvergence(max_iter)
+    raise RuntimeError(f"PageRank failed to converge in {max_iter} iterations (L1 residual {diff:.3g})")
+
+
 def compute_weighted_pagerank(
     nodes: List[str],
     edges: List[Tuple[str, str, float]],
@@ -91,36 +179,26 @@ def compute_weighted_pagerank(
         node_activity: Optional activity scores for nodes
         use_enhanced: Whether to use enhanced temporal PageRank
     """
-    if not NETWORKX_AVAILABLE:
-        # Simplified computation without networkx
-        scores = {node: 1.0 / len(nodes) for node in nodes}
-        for _ in range(max_iter):
-            new_scores = {node: (1 - alpha) / len(nodes) for node in nodes}
-            for source, target, weight in edges:
-                if source in scores:
-                    new_scores[target] += alpha * scores[source] * weight
-            if max(abs(new_scores[node] - scores[node]) for node in nodes) < tol:
-                break
-            scores = new_scores
-        return scores
-    
-    # Use networkx for proper PageRank
-    G = nx.DiGraph()
-    G.add_nodes_from(nodes)
-    for source, target, weight in edges:
-        G.add_edge(source, target, weight=weight)
-    
     # Use enhanced temporal PageRank if available and requested
-    if use_enhanced and edge_timestamps is not None:
+    if NETWORKX_AVAILABLE and use_enhanced and edge_timestamps is not None:
         try:
             from enhanced_pagerank import TemporalPageRank
+            G = nx.DiGraph()
+            G.add_nodes_from(nodes)
+            for source, target, weight in edges:
+                G.add_edge(source, target, weight=weight)
             temporal_pr = TemporalPageRank(alpha=alpha, max_iter=max_iter, tol=tol)
             return temporal_pr.compute(G, edge_timestamps, node_activity)
         except ImportError:
             print("Warning: enhanced_pagerank not available, using standard PageRank")
     
-    pagerank = nx.pagerank(G, alpha=alpha, max_iter=max_iter, tol=tol, weight='weight')
-    return pagerank
+    if not nodes and not edges:
+        return {}
+    
+    # Materialize the graph once as CSR; each iteration is a single SpMV
+    M, dangling, node_list = build_transition_matrix(nodes, edges)
+    pr = sparse_pagerank(M, dangling, alpha=alpha, max_iter=max_iter, tol=tol)
+    return dict(zip(node_list, pr.tolist()))
 
 
 def compute_temporal_weighted_pagerank(
@@ -152,69 +230,93 @@ def compute_temporal_weighted_pagerank(
     Returns:
         Dict mapping node ID to PageRank score
     """
-    import time
+    node_ids = [n['id'] if isinstance(n, dict) else n for n in nodes]
+    if not edges:
+        return compute_weighted_pagerank(node_ids, [], alpha, max_iter, tol)
     
-    if not NETWORKX_AVAILABLE:
-        # Fallback to basic weighted PageRank
-        node_ids = [n['id'] if isinstance(n, dict) else n for n in nodes]
-        edge_tuples = [(e['source'], e['target'], e.get('weight', 1.0)) for e in edges]
-        return compute_weighted_pagerank(node_ids, edge_tuples, alpha, max_iter, tol)
+    # Gather per-edge attributes once, then derive all weights in one vectorized pass
+    now = time.time() * 1000  # milliseconds
+    max_age = 365 * 24 * 60 * 60 * 1000  # 1 year in ms
     
-    G = nx.DiGraph()
+    metadata = [edge.get('metadata') or {} for edge in edges]
+    base_weight = np.fromiter((e.get('weight', 1.0) for e in edges), dtype=np.float64, count=len(edges))
+    timestamp = np.fromiter((e.get('timestamp', now) for e in edges), dtype=np.float64, count=len(edges))
+    stake_backed = np.fromiter((bool(m.get('stakeBacked')) for m in metadata), dtype=bool, count=len(edges))
+    verified = np.fromiter((bool(m.get('verified')) for m in metadata), dtype=bool, count=len(edges))
+    payment_amount = np.fromiter((m.get('paymentAmount') or 0.0 for m in metadata), dtype=np.float64, count=len(edges))
     
-    # Add nodes
-    node_ids = []
-    for node in nodes:
-        node_id = node['id'] if isinstance(node, dict) else node
-        node_ids.append(node_id)
-        G.add_node(node_id, **({} if isinstance(node, dict) else {}))
+    # Temporal decay
+    temporal_factor = np.exp(-temporal_decay * (now - timestamp) / max_age)
     
-    # Add edges with temporal and enhanced weights
-    now = time.time() * 1000  # milliseconds
-    max_age = 365 * 24 * 60 * 60 * 1000  # 1 year in ms
+    # Boosts for stake-backed, payment-backed and verified edges
+    enhanced_weight = base_weight * np.where(stake_backed, 1.2, 1.0)
+    payment_boost = np.minimum(1.0, np.log1p(payment_amount / 1000) / 10)
+    enhanced_weight *= np.where(payment_amount != 0, 1 + 0.15 * payment_boost, 1.0)
+    enhanced_weight *= np.where(verified, 1.2, 1.0)
     
-    for edge in edges:
-        source = edge['source']
-        target = edge['target']
-        base_weight = edge.get('weight', 1.0)
-        timestamp = edge.get('timestamp', now)
-        
-        # Calculate temporal decay
-        age = now - timestamp
-        age_in_years = age / max_age
-        temporal_factor = np.exp(-temporal_decay * age_in_years)
-        
-        # Enhance weight based on metadata
-        enhanced_weight = base_weight
-        
-        # Boost for stake-backed edges
-        if edge.get('metadata', {}).get('stakeBacked'):
-            enhanced_weight *= 1.2
-        
-        # Boost for payment-backed edges
-        if edge.get('metadata', {}).get('paymentAmount'):
-            payment_amount = edge['metadata']['paymentAmount']
-            payment_boost = min(1, np.log(1 + payment_amount / 1000) / 10)
-            enhanced_weight *= (1 + 0.15 * payment_boost)
-        
-        # Boost for verified endorsements
-        if edge.get('metadata', {}).get('verified'):
-            enhanced_weight *= 1.2
-        
-        # Apply temporal decay
-        final_weight = enhanced_weight * (recency_weight + (1 - recency_weight) * temporal_factor)
-        
-        G.add_edge(source, target, weight=final_weight)
+    # Apply temporal decay
+    final_weight = enhanced_weight * (recency_weight + (1 - recency_weight) * temporal_factor)
     
-    # Compute PageRank
-    pagerank = nx.pagerank(G, alpha=alpha, max_iter=max_iter, tol=tol, weight='weight')
-    return pagerank
+    edge_tuples = [
+        (edge['source'], edge['target'], w)
+        for edge, w in zip(edges, final_weight.tolist())
+    ]
+    return compute_weighted_pagerank(node_ids, edge_tuples, alpha, max_iter, tol)
+
+
+def _detect_sybil_communities(
+    edges: List[Tuple[str, str, float]],
+    stake_weights: Dict[str, float],
+    min_density: float = 0.3,
+    max_stake_ratio: float = 0.5,
+    min_size: int = 3
+) -> Dict[str, float]:
+    """
+    Flag Louvain communities that look like Sybil clusters
+    
+    A community is suspicious when it is densely interconnected (directed
+    edge density >= min_density) while its average stake is below
+    max_stake_ratio of the median stake. Members get
+    penalty = min(1, density * (1 - avg_stake / median_stake)).
+    
+    Returns:
+        Dict mapping flagged node ID to community penalty
+    """
+    if not NETWORKX_AVAILABLE or not edges:
+        return {}
+    
+    stakes = [s for s in stake_weights.values() if s > 0]
+    median_stake = float(np.median(stakes)) if stakes else 0.0
+    if median_stake <= 0:
+        # Without a stake reference the low-stake condition is meaningless
+        return {}
+    
+    G = nx.DiGraph()
+    G.add_weighted_edges_from(edges)
+    communities = nx.community.louvain_communities(
+        G.to_undirected(as_view=True), weight='weight', resolution=1.0, seed=42
+    )
+    
+    penalties = {}
+    for community in communities:
+        size = len(community)
+        if size < min_size:
+            continue
+        density = G.subgraph(community).number_of_edges() / (size * (size - 1))
+        avg_stake = sum(stake_weights.get(node, 0.0) for node in community) / size
+        if density < min_density or avg_stake >= max_stake_ratio * median_stake:
+            continue
+        penalty = min(1.0, density * (1.0 - avg_stake / median_stake))
+        for node in community:
+            penalties[node] = penalty
+    return penalties
 
 
 def detect_sybil_clusters(
     nodes: List[str],
     edges: List[Tuple[str, str, float]],
-    pagerank_scores: Dict[str, float]
+    pagerank_scores: Dict[str, float],
+    stake_weights: Optional[Dict[str, float]] = None
 ) -> Dict[str, float]:
     """
     Detect potential Sybil clusters and compute penalty scores
@@ -223,51 +325,61 @@ def detect_sybil_clusters(
     - High in-degree but low PageRank (z-score < -1)
     - Very high out-degree (potential spam)
     - Low reciprocity (many incoming but few outgoing)
+    - Dense, low-stake Louvain communities (when stake_weights are given)
     """
-    if not NETWORKX_AVAILABLE:
-        # Simplified: penalize nodes with very low scores
-        penalties = {}
-        min_score = min(pagerank_scores.values()) if pagerank_scores else 0
-        for node in nodes:
-            score = pagerank_scores.get(node, 0)
-            if score < min_score * 2:  # Very low score
-                penalties[node] = min(0.2, (min_score * 2 - score) * 0.1)
-            else:
-                penalties[node] = 0.0
-        return penalties
-    
-    G = nx.DiGraph()
-    G.add_nodes_from(nodes)
-    for source, target, weight in edges:
-        G.add_edge(source, target, weight=weight)
+    node_list = list(nodes)
+    if not node_list:
+        return {}
+    
+    # Integer-index every endpoint so the graph becomes flat edge arrays
+    index = {node: i for i, node in enumerate(node_list)}
+    for source, target, _ in edges:
+        for node in (source, target):
+            if node not in index:
+                index[node] = len(index)
+    n = len(index)
+    
+    # Degrees over the deduplicated edge set (DiGraph semantics), counted
+    # with bincount over unique (source, target) codes
+    src = np.fromiter((index[e[0]] for e in edges), dtype=np.int64, count=len(edges))
+    dst = np.fromiter((index[e[1]] for e in edges), dtype=np.int64, count=len(edges))
+    codes = np.unique(src * n + dst)
+    in_degrees = np.bincount(codes % n, minlength=n)
+    out_degrees = np.bincount(codes // n, minlength=n)
+    
+    node_idx = np.fromiter((index[node] for node in node_list), dtype=np.int64, count=len(node_list))
+    in_degree = in_degrees[node_idx]
+    out_degree = out_degrees[node_idx]
     
     # Compute statistics for z-score calculation
     scores_array = list(pagerank_scores.values())
     mean_score = np.mean(scores_array) if scores_array else 0
     std_score = np.std(scores_array) if len(scores_array) > 1 and scores_array else 1
     
-    penalties = {}
-    for node in nodes:
-        in_degree = G.in_degree(node)
-        out_degree = G.out_degree(node)
-        score = pagerank_scores.get(node, 0)
-        z_score = (score - mean_score) / std_score if std_score > 0 else 0
-        
-        sybil_probability = 0.0
-        
-        # Pattern 1: High in-degree but low PageRank (z-score < -1)
-        if z_score < -1 and in_degree > 5:
-            sybil_probability += 0.4
-        
-        # Pattern 2: Very high out-degree (potential spam)
-        if out_degree > 20 and in_degree < 2:
-            sybil_probability += 0.3
-        
-        # Pattern 3: Low reciprocity (many incoming but few outgoing)
-        if in_degree > 10 and out_degree < 2:
-            sybil_probability += 0.3
-        
-        penalties[node] = min(1.0, sybil_probability)
+    score = np.fromiter((pagerank_scores.get(node, 0) for node in node_list), dtype=np.float64, count=len(node_list))
+    if std_score > 0:
+        z_score = (score - mean_score) / std_score
+    else:
+        z_score = np.zeros(len(node_list))
+    
+    sybil_probability = np.zeros(len(node_list))
+    
+    # Pattern 1: High in-degree but low PageRank (z-score < -1)
+    sybil_probability += np.where((z_score < -1) & (in_degree > 5), 0.4, 0.0)
+    
+    # Pattern 2: Very high out-degree (potential spam)
+    sybil_probability += np.where((out_degree > 20) & (in_degree < 2), 0.3, 0.0)
+    
+    # Pattern 3: Low reciprocity (many incoming but few outgoing)
+    sybil_probability += np.where((in_degree > 10) & (out_degree < 2), 0.3, 0.0)
+    
+    penalties = dict(zip(node_list, np.minimum(1.0, sybil_probability).tolist()))
+    
+    # Community-level evidence: keep the stronger of the two penalties
+    if stake_weights:
+        for node, penalty in _detect_sybil_communities(edges, stake_weights).items():
+            if node in penalties and penalty > penalties[node]:
+                penalties[node] = penalty
     
     return penalties
 
@@ -326,60 +438,64 @@ def compute_final_reputation(
             'payment': 0.1
         }
     
+    nodes = list(pagerank_scores)
+    if not nodes:
+        return {}
+    n = len(nodes)
+    
+    # Gather every component into aligned arrays once, then score all nodes together
+    pr = np.fromiter(pagerank_scores.values(), dtype=np.float64, count=n)
+    stake = np.fromiter((stake_weights.get(node, 0.0) for node in nodes), dtype=np.float64, count=n)
+    quality = np.fromiter((quality_scores.get(node, 0) for node in nodes), dtype=np.float64, count=n)
+    payment = np.fromiter((payment_scores.get(node, 0) for node in nodes), dtype=np.float64, count=n)
+    sybil = np.fromiter((sybil_penalties.get(node, 0.0) for node in nodes), dtype=np.float64, count=n)
+    
+    # Component scores are the columns of one (n, 4) matrix in the same order
+    # as w_vec, so the weighted hybrid score is a single matrix-vector product
+    components = np.empty((n, 4))
+    graph_arr, quality_arr, stake_arr, payment_arr = components.T
+    w_vec = np.array([weights['graph'], weights['quality'], weights['stake'], weights['payment']])
+    
     # Normalize PageRank scores to 0-1000 range
-    pr_values = list(pagerank_scores.values())
-    pr_min = min(pr_values) if pr_values else 0
-    pr_max = max(pr_values) if pr_values else 1
-    pr_range = pr_max - pr_min if pr_max > pr_min else 1
+    pr_min = pr.min()
+    pr_range = pr.max() - pr_min
+    if pr_range <= 0:
+        pr_range = 1
+    graph_arr[:] = ((pr - pr_min) / pr_range) * 1000
     
-    results = {}
-    all_final_scores = []
+    # Log-scaled stake/payment scores (zero for non-positive inputs)
+    stake_arr[:] = np.minimum(1000, np.log1p(np.maximum(stake, 0) / 100) * 200)
+    quality_arr[:] = quality * 10  # scale 0-100 to 0-1000
+    payment_arr[:] = np.minimum(1000, np.log1p(np.maximum(payment, 0) / 1000) * 200)
     
-    for node in pagerank_scores:
-        # Normalize graph score
-        graph_score = pagerank_scores[node]
-        normalized_graph_score = ((graph_score - pr_min) / pr_range) * 1000
-        
-        # Extract component scores
-        stake_weight = stake_weights.get(node, 0.0)
-        stake_score = min(1000, np.log(1 + stake_weight / 100) * 200) if stake_weight > 0 else 0
-        
-        quality_score = quality_scores.get(node, 0) * 10  # scale 0-100 to 0-1000
-        payment_score = min(1000, np.log(1 + payment_scores.get(node, 0) / 1000) * 200) if payment_scores.get(node, 0) > 0 else 0
-        
-        sybil_penalty = sybil_penalties.get(node, 0.0)
-        
-        # Compute weighted hybrid score
-        final_score = (
-            normalized_graph_score * weights['graph'] +
-            quality_score * weights['quality'] +
-            stake_score * weights['stake'] +
-            payment_score * weights['payment']
-        )
-        
-        # Apply Sybil penalty
-        final_score = final_score * (1.0 - sybil_penalty * 0.5)
-        final_score = max(0.0, min(1000.0, final_score))  # Clamp to [0, 1000]
-        
-        all_final_scores.append(final_score)
-        
-        results[node] = {
+    # Compute weighted hybrid score
+    final_arr = components @ w_vec
+    
+    # Apply Sybil penalty and clamp to [0, 1000]
+    final_arr = np.clip(final_arr * (1.0 - sybil * 0.5), 0.0, 1000.0)
+    
+    # Percentile = share of nodes scoring at or below this node
+    sorted_scores = np.sort(final_arr)
+    percentile_arr = np.searchsorted(sorted_scores, final_arr, side='right') / n * 100
+    
+    return {
+        node: {
             "reputationScore": final_score,
-            "graphScore": normalized_graph_score,
+            "graphScore": graph_score,
             "qualityScore": quality_score,
             "stakeScore": stake_score,
             "paymentScore": payment_score,
             "stakeWeight": stake_weight,
-            "sybilPenalty": sybil_penalty
+            "sybilPenalty": sybil_penalty,
+            "percentile": percentile
         }
-    
-    # Compute percentiles
-    all_final_scores.sort(reverse=True)
-    for node, data in results.items():
-        rank = next((i for i, score in enumerate(all_final_scores) if score <= data["reputationScore"]), len(all_final_scores))
-        data["percentile"] = ((len(all_final_scores) - rank) / len(all_final_scores)) * 100
-    
-    return results
+        for node, final_score, graph_score, quality_score, stake_score, payment_score,
+            stake_weight, sybil_penalty, percentile in zip(
+            nodes, final_arr.tolist(), graph_arr.tolist(), quality_arr.tolist(),
+            stake_arr.tolist(), payment_arr.tolist(), stake.tolist(), sybil.tolist(),
+            percentile_arr.tolist()
+        )
+    }
 
 
 def run_sybil_test() -> Dict[str, float]:
@@ -450,7 +566,7 @@ def main():
     # Compute reputation
     print(f"Computing reputation for {len(nodes)} nodes...")
     pagerank_scores = compute_weighted_pagerank(nodes, edges, alpha=args.alpha)
-    sybil_penalties = detect_sybil_clusters(nodes, edges, pagerank_scores)
+    sybil_penalties = detect_sybil_clusters(nodes, edges, pagerank_scores, stake_weights)
     final_reputation = compute_final_reputation(pagerank_scores, stake_weights, sybil_penalties)
     
     # Output results
@@ -461,8 +577,7 @@ def main():
     }
     
     if args.output:
-        with open(args.output, 'w') as f:
-            json.dump(results, f, indent=2)
+        write_results(results, args.output)
         print(f"Results written to {args.output}")
     else:
         print(json.dumps(results, indent=2))
@@ -470,7 +585,7 @@ def main():
     # Publish if requested
     if args.publish:
         print("\nPublishing ReputationAssets...")
-        published = []
+        assets = []
         for node_id, rep_data in final_reputation.items():
             try:
                 asset = create_reputation_asset(
@@ -481,24 +596,31 @@ def main():
                     sybil_penalty=rep_data["sybilPenalty"],
                     alpha=args.alpha
                 )
-                
-                result = publish_to_edge_node(
-                    asset,
-                    edge_url=args.edge_url,
-                    api_key=args.api_key,
-                    simulate=args.simulate
-                )
-                
-                published.append({
-                    "node": node_id,
-                    "ual": result.get("ual"),
-                    "simulated": result.get("simulated", False)
-                })
-                
-                print(f"Published: {node_id} -> {result.get('ual')}")
+                assets.append((node_id, asset))
             except Exception as e:
                 print(f"Error publishing {node_id}: {e}", file=sys.stderr)
         
+        # Publish all assets concurrently instead of one round-trip at a time
+        published = []
+        try:
+            results = asyncio.run(publish_many(
+                [asset for _, asset in assets],
+                edge_url=args.edge_url,
+                api_key=args.api_key,
+                simulate=args.simulate
+            ))
+        except Exception as e:
+            print(f"Error publishing ReputationAssets: {e}", file=sys.stderr)
+            results = []
+        
+        for (node_id, _), result in zip(assets, results):
+            published.append({
+                "node": node_id,
+                "ual": result.get("ual"),
+                "simulated": result.get("simulated", False)
+            })
+            print(f"Published: {node_id} -> {result.get('ual')}")
+        
         print(f"\nPublished {len(published)} ReputationAssets")
     
     return 0
@@ -593,8 +715,7 @@ def run_advanced_analysis(args):
     
     # Output results
     if args.output:
-        with open(args.output, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        write_results(results, args.output, default=str)
         print(f"\n✓ Results written to {args.output}")
     else:
         print("\n" + "=" * 60)
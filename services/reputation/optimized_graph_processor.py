@@ -131,6 +131,11 @@ class OptimizedGraphProcessor:
                 updated_users.add(from_user)
                 updated_users.add(to_user)
         
+        # The analyzer keys its graph-wide results by node count and version,
+        # so edge-only changes made here must be announced explicitly
+        if updated_users:
+            self.analyzer.invalidate_cache()
+        
         # Invalidate cache for updated users
         cache_keys_to_remove = [
             key for key in self.cache.keys()
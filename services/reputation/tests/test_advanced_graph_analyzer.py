@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AdvancedGraphAnalyzer graph-wide metrics
+"""
+
+import sys
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import advanced_graph_analyzer
+from advanced_graph_analyzer import AdvancedGraphAnalyzer, IGRAPH_AVAILABLE, NETWORKIT_AVAILABLE
+
+
+def _random_graph(n=200, seed=7):
+    """Sparse random DiGraph with string node ids and mixed edge weights"""
+    G = nx.gnp_random_graph(n, 4.0 / n, seed=seed, directed=True)
+    G = nx.relabel_nodes(G, {i: f"did:{i}" for i in G})
+    for i, (u, v) in enumerate(G.edges):
+        G[u][v]["weight"] = (0.5, 1.0, 2.0)[i % 3]
+    return G
+
+
+@pytest.mark.skipif(not IGRAPH_AVAILABLE, reason="igraph not installed")
+def test_igraph_centralities_match_networkx():
+    """igraph betweenness/PageRank must be drop-in replacements for the NetworkX ones"""
+    G = _random_graph()
+    analyzer = AdvancedGraphAnalyzer(G)
+
+    betweenness = analyzer._compute_betweenness()
+    expected = nx.betweenness_centrality(G)
+    assert max(abs(betweenness[n] - expected[n]) for n in G) < 1e-12
+
+    pagerank = analyzer._compute_pagerank()
+    expected = nx.pagerank(G, alpha=0.85, tol=1e-12)
+    assert max(abs(pagerank[n] - expected[n]) for n in G) < 1e-8
+
+
+@pytest.mark.skipif(not NETWORKIT_AVAILABLE, reason="networkit not installed")
+def test_networkit_closeness_matches_networkx():
+    """NetworKit's generalized closeness on the reversed graph must equal nx.closeness_centrality"""
+    G = _random_graph()
+    closeness = AdvancedGraphAnalyzer(G)._compute_closeness()
+    expected = nx.closeness_centrality(G)
+    assert max(abs(closeness[n] - expected[n]) for n in G) < 1e-12
+
+
+def test_persistent_cache_survives_new_analyzer(tmp_path):
+    """A fresh analyzer over the same graph must load centralities from disk instead of recomputing"""
+    G = _random_graph()
+    first = AdvancedGraphAnalyzer(G, cache_dir=str(tmp_path))
+    pagerank = first._get_or_compute("pagerank", first._compute_pagerank)
+    assert list(tmp_path.glob("*-pagerank.npz"))
+
+    second = AdvancedGraphAnalyzer(G.copy(), cache_dir=str(tmp_path))
+    assert second._get_or_compute("pagerank", lambda: pytest.fail("recomputed")) == pagerank
+
+    # A different graph hashes differently and misses the cache
+    G.add_edge("did:0", "did:1", weight=3.0)
+    third = AdvancedGraphAnalyzer(G, cache_dir=str(tmp_path))
+    assert third._get_or_compute("pagerank", lambda: {}) == {}
+
+
+def test_arpack_eigenvector_matches_networkx():
+    """ARPACK eigenvector centrality on the cached CSR must equal nx.eigenvector_centrality_numpy"""
+    G = nx.gnp_random_graph(150, 0.06, seed=3, directed=True)
+    assert nx.is_strongly_connected(G)
+    eigenvector = AdvancedGraphAnalyzer(G)._compute_eigenvector()
+    expected = nx.eigenvector_centrality_numpy(G)
+    assert max(abs(eigenvector[n] - expected[n]) for n in G) < 1e-10
+
+
+def test_batch_score_combination_matches_per_user():
+    """The matrix forms of the weighted sums must agree with the per-user dict versions"""
+    analyzer = AdvancedGraphAnalyzer(_random_graph())
+    rng = np.random.default_rng(0)
+
+    structural = rng.uniform(-0.2, 1.2, size=(8, len(analyzer._STRUCT_KEYS)))
+    # The dict version scales raw PageRank by 100 itself
+    raw = structural / [100, 1, 1, 1, 1, 1]
+    expected = [analyzer.normalize_structural_scores(dict(zip(analyzer._STRUCT_KEYS, row)))["combined"] for row in raw]
+    assert np.allclose(analyzer.normalize_structural_scores_batch(structural), expected)
+
+    behavioral = rng.uniform(-0.2, 1.2, size=(8, len(analyzer._BEHAV_KEYS)))
+    expected = [analyzer.normalize_behavioral_scores(dict(zip(analyzer._BEHAV_KEYS, row)))["combined"]
+                for row in behavioral]
+    assert np.allclose(analyzer.normalize_behavioral_scores_batch(behavioral), expected)
+
+    combined = rng.uniform(0.0, 1.5, size=(8, len(analyzer._OVERALL_DIMENSIONS)))
+    expected = [analyzer.combine_scores({dim: {"combined": v} for dim, v in zip(analyzer._OVERALL_DIMENSIONS, row)})
+                for row in combined]
+    assert np.allclose(analyzer.combine_scores_batch(combined), expected)
+
+
+def test_csr_pagerank_matches_networkx(monkeypatch):
+    """The sparse power-iteration fallback (no igraph) must converge to nx.pagerank's fixed point"""
+    monkeypatch.setattr(advanced_graph_analyzer, "IGRAPH_AVAILABLE", False)
+    G = _random_graph(n=1000)
+    pagerank = AdvancedGraphAnalyzer(G)._compute_pagerank()
+    expected = nx.pagerank(G, alpha=0.85, tol=1e-12)
+    assert sum(abs(pagerank[n] - expected[n]) for n in G) < 1e-5
@@ -16,30 +16,40 @@ from compute_reputation import (
 )
 
 
+def _ring(prefix, n):
+    """Nodes prefix_0..prefix_{n-1} linked in a directed cycle"""
+    nodes = [f"{prefix}_{i}" for i in range(n)]
+    edges = [(nodes[i], nodes[(i + 1) % n], 1.0) for i in range(n)]
+    return nodes, edges
+
+
+def _clique(prefix, n):
+    """Nodes prefix_0..prefix_{n-1} with edges in both directions between every pair"""
+    nodes = [f"{prefix}_{i}" for i in range(n)]
+    edges = [(a, b, 1.0) for a in nodes for b in nodes if a != b]
+    return nodes, edges
+
+
 def test_sybil_detection():
     """Test Sybil detection with synthetic data"""
-    # Create legitimate nodes
-    legit_nodes = [f"legit_{i}" for i in range(10)]
-    legit_edges = [
-        (f"legit_{i}", f"legit_{(i+1) % 10}", 1.0)
-        for i in range(10)
-    ]
-    
-    # Inject Sybil cluster
-    sybil_nodes = [f"sybil_{i}" for i in range(20)]
-    sybil_edges = [
-        (f"sybil_{i}", f"sybil_{(i+1) % 20}", 1.0)
-        for i in range(20)
-    ]
+    # Create legitimate, staked nodes
+    legit_nodes, legit_edges = _ring("legit", 30)
+    
+    # Inject a Sybil cluster whose members all vouch for each other. A bare
+    # 20-node ring without stakes is not detectable: every node in it has the
+    # same degrees as the honest ring, and the community signal needs stakes
+    sybil_nodes, sybil_edges = _clique("sybil", 20)
     # Connect one Sybil to legitimate graph
     sybil_edges.append(("sybil_0", "legit_0", 0.1))
+    stakes = {node: 1000.0 for node in legit_nodes}
+    stakes.update({node: 10.0 for node in sybil_nodes})
     
     all_nodes = legit_nodes + sybil_nodes
     all_edges = legit_edges + sybil_edges
     
     # Compute reputation
     pagerank = compute_weighted_pagerank(all_nodes, all_edges)
-    sybil_penalties = detect_sybil_clusters(all_nodes, all_edges, pagerank)
+    sybil_penalties = detect_sybil_clusters(all_nodes, all_edges, pagerank, stakes)
     
     # Check detection
     detected_sybils = [node for node in sybil_nodes if sybil_penalties.get(node, 0) > 0.05]
@@ -51,7 +61,25 @@ def test_sybil_detection():
     return precision
 
 
+def test_sybil_community_detection():
+    """A dense, low-stake clique is penalized when stakes are known"""
+    legit_nodes, legit_edges = _ring("legit", 30)
+    sybil_nodes, sybil_edges = _clique("sybil", 8)
+    sybil_edges.append(("sybil_0", "legit_0", 0.1))
+    stakes = {node: 1000.0 for node in legit_nodes}
+    stakes.update({node: 10.0 for node in sybil_nodes})
+    
+    all_nodes = legit_nodes + sybil_nodes
+    all_edges = legit_edges + sybil_edges
+    pagerank = compute_weighted_pagerank(all_nodes, all_edges)
+    sybil_penalties = detect_sybil_clusters(all_nodes, all_edges, pagerank, stakes)
+    
+    assert all(sybil_penalties[node] > 0.5 for node in sybil_nodes)
+    assert all(sybil_penalties[node] == 0.0 for node in legit_nodes)
+
+
 if __name__ == "__main__":
+    test_sybil_community_detection()
     precision = test_sybil_detection()
     print(f"Test passed with {precision:.2%} precision")
 